@@ -0,0 +1,157 @@
+"""One-off backfill of the index keys newer code writes on every item.
+
+Items written before these attributes existed are missing from the sparse
+GSIs that read them, so run this once after deploying and before relying on
+those indexes:
+
+    python -m app.backfill
+
+Only items still missing an attribute are updated, and the values written
+are the ones live writes would set, so the backfill is safe to re-run and to
+run alongside live traffic.
+"""
+
+import asyncio
+from typing import Dict
+
+from app.database import (EVENT_ENTITY_TYPE, VENUE_ENTITY_TYPE,
+                          booking_state_key, city_key, db_client)
+from app.routers.analytics import BOOKING_SK_PREFIX
+
+
+async def backfill_booking_states() -> Dict[str, int]:
+    """Set event_state on bookings written before the bookings-by-state index,
+    then mark their events so analytics counts them from the index"""
+    counts = {"bookings": 0, "events": 0}
+
+    bookings = db_client.scan_iter(
+        "begins_with(sk, :prefix) AND attribute_exists(booking_id) "
+        "AND attribute_not_exists(event_state)",
+        {":prefix": BOOKING_SK_PREFIX},
+    )
+    async for booking in bookings:
+        # A booking cancelled meanwhile gets its event_state from the cancel,
+        # which fails this condition and leaves that value in place
+        result = await db_client.update_item_conditional(
+            booking["pk"],
+            booking["sk"],
+            "SET event_state = :event_state",
+            "attribute_not_exists(event_state)",
+            {
+                ":event_state": booking_state_key(
+                    booking["pk"], booking.get("state", "confirmed")
+                )
+            },
+        )
+        if result["status"] == "success":
+            counts["bookings"] += 1
+
+    # Bookings confirmed from here on carry event_state already
+    events = db_client.scan_iter(
+        "sk = :event AND attribute_not_exists(booking_states_indexed)",
+        {":event": "EVENT"},
+    )
+    async for event in events:
+        result = await db_client.update_item_conditional(
+            event["pk"],
+            "EVENT",
+            "SET booking_states_indexed = :indexed",
+            "attribute_exists(pk)",
+            {":indexed": True},
+        )
+        if result["status"] == "success":
+            counts["events"] += 1
+
+    return counts
+
+
+async def backfill_entity_types(sk: str, entity_type: str) -> int:
+    """Set entity_type on items of one kind (by sort key) that lack it, so the
+    entity type GSIs list them"""
+    updated = 0
+    items = db_client.scan_iter(
+        "sk = :sk AND attribute_not_exists(entity_type)", {":sk": sk}
+    )
+    async for item in items:
+        result = await db_client.update_item_conditional(
+            item["pk"],
+            sk,
+            "SET entity_type = :entity_type",
+            "attribute_exists(pk) AND attribute_not_exists(entity_type)",
+            {":entity_type": entity_type},
+        )
+        if result["status"] == "success":
+            updated += 1
+    return updated
+
+
+async def backfill_venue_keys() -> int:
+    """Set entity_type and city_key on venues that lack them, so the entity
+    city GSI lists them"""
+    updated = 0
+    venues = db_client.scan_iter(
+        "sk = :sk AND attribute_not_exists(city_key)", {":sk": "VENUE"}
+    )
+    async for venue in venues:
+        result = await db_client.update_item_conditional(
+            venue["pk"],
+            "VENUE",
+            "SET entity_type = :entity_type, city_key = :city_key",
+            "attribute_exists(pk)",
+            {
+                ":entity_type": VENUE_ENTITY_TYPE,
+                ":city_key": city_key(venue.get("city", "")),
+            },
+        )
+        if result["status"] == "success":
+            updated += 1
+    return updated
+
+
+async def backfill_event_cities() -> int:
+    """Copy the venue's city (and its city_key) onto events created before
+    events carried it, so the city GSI finds them"""
+    updated = 0
+    events = db_client.scan_iter(
+        "sk = :sk AND attribute_not_exists(city_key)", {":sk": "EVENT"}
+    )
+    async for event in events:
+        venue_result = await db_client.get_venue(event["venue_id"])
+        if venue_result["status"] != "success":
+            continue
+        # An empty string can't be a GSI key, so cityless venues are skipped
+        venue_city = venue_result["item"].get("city", "")
+        if not city_key(venue_city):
+            continue
+        result = await db_client.update_item_conditional(
+            event["pk"],
+            "EVENT",
+            "SET city = :city, city_key = :city_key",
+            "attribute_exists(pk)",
+            {":city": venue_city, ":city_key": city_key(venue_city)},
+        )
+        if result["status"] == "success":
+            updated += 1
+    return updated
+
+
+async def main() -> None:
+    event_count = await backfill_entity_types("EVENT", EVENT_ENTITY_TYPE)
+    print(f"Set entity_type on {event_count} events")
+
+    venue_count = await backfill_venue_keys()
+    print(f"Set entity_type and city_key on {venue_count} venues")
+
+    city_count = await backfill_event_cities()
+    print(f"Set city and city_key on {city_count} events")
+
+    booking_counts = await backfill_booking_states()
+    print(
+        f"Set event_state on {booking_counts['bookings']} bookings "
+        f"across {booking_counts['events']} events"
+    )
+    await db_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+from cachetools import TTLCache
+
+
+def async_ttl_cache(maxsize: int = 1024, ttl: float = 30):
+    """Cache an async function's results by its arguments for ttl seconds"""
+
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+
+            # Exceptions (e.g. HTTPException) propagate and are not cached
+            result = await func(*args, **kwargs)
+            cache[key] = result
+            return result
+
+        def invalidate(**match: Any) -> None:
+            """Drop cached results whose keyword arguments include match"""
+            for key in list(cache.keys()):
+                kwargs = dict(key[1])
+                if all(kwargs.get(name) == value for name, value in match.items()):
+                    cache.pop(key, None)
+
+        wrapper.invalidate = invalidate
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -1,14 +1,138 @@
+import asyncio
+import copy
+import hashlib
 import json
 import os
-from typing import Any, Dict, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Tuple
 
 import boto3
+import msgpack
+import redis
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from cachetools import TTLCache
 from dotenv import load_dotenv
+from redis import asyncio as aioredis
 
 # Load environment variables
 load_dotenv()
 
+# Size of the HTTP connection pool (and the thread pool feeding it)
+MAX_POOL_CONNECTIONS = max(64, 4 * (os.cpu_count() or 1))
+
+# Fail fast on a stuck connection and let adaptive retries take over
+CONNECT_TIMEOUT = 1.0
+READ_TIMEOUT = 3.0
+MAX_RETRY_ATTEMPTS = 5
+
+# DynamoDB limits BatchGetItem to 100 keys per request
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+BATCH_MAX_RETRIES = 5
+
+# TransactWriteItems takes at most 100 actions
+TRANSACT_WRITE_LIMIT = 100
+
+
+# Venues rarely change, so lookups are memoized for a few minutes
+VENUE_CACHE_SIZE = 10_000
+VENUE_CACHE_TTL = 300
+
+# GSI over events keyed by lowercased venue city, sorted by start_time
+EVENTS_BY_CITY_INDEX = "GSI_byCity"
+
+# Sparse GSI over items carrying entity_type (only events set it), sorted by
+# start_time, so listing events reads just event items
+EVENTS_BY_TYPE_INDEX = "GSI_byEntityType"
+EVENT_ENTITY_TYPE = "EVENT"
+
+# GSI over items carrying entity_type keyed by city_key; venues set entity_type
+# too (but no start_time), so venues are listed from here
+ENTITIES_BY_CITY_INDEX = "GSI_byEntityCity"
+VENUE_ENTITY_TYPE = "VENUE"
+
+# Sparse KEYS_ONLY index over bookings: event_state = "<event_id>#<state>"
+BOOKINGS_BY_STATE_INDEX = "GSI_byEventState"
+
+
+# GSI over bookings keyed by user_id, sorted by booking_date (holdings and
+# users lack booking_date, so only bookings are indexed)
+BOOKINGS_BY_USER_INDEX = "GSI_byUser"
+
+# Sparse GSI over holdings and bookings keyed by record_id (the holding_id or
+# booking_id), so confirm/cancel can find a record without scanning the table
+RECORDS_BY_ID_INDEX = "GSI_byRecordId"
+
+
+def booking_state_key(event_id: str, state: str) -> str:
+    """Partition key of a booking in the bookings-by-state index"""
+    return f"{event_id}#{state}"
+
+
+def city_key(city: str) -> str:
+    """City as the city GSIs key it, for events and venues alike, so city
+    lookups are case-insensitive"""
+    return city.lower().strip()
+
+
+# Point reads are cached briefly; GSI list queries go stale faster
+ITEM_CACHE_SIZE = 100_000
+ITEM_CACHE_TTL = 5
+GSI_CACHE_SIZE = 10_000
+GSI_CACHE_TTL = 2
+
+# Seconds before the table's GSI list is described again
+INDEX_NAMES_TTL = 60
+
+# Seconds a cached scan result lives in Redis
+SCAN_CACHE_TTL = 30
+
+# Segments for full-table scans on request paths that still lack an index
+PARALLEL_SCAN_SEGMENTS = 8
+
+# msgpack extension codes for types DynamoDB returns that msgpack lacks
+_EXT_DECIMAL = 1
+_EXT_SET = 2
+
+
+def _pack_default(obj: Any) -> msgpack.ExtType:
+    """Encode DynamoDB number and set values for msgpack"""
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(obj).encode())
+    if isinstance(obj, set):
+        return msgpack.ExtType(_EXT_SET, _pack(list(obj)))
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _unpack_ext(code: int, data: bytes) -> Any:
+    """Decode values written by _pack_default"""
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    if code == _EXT_SET:
+        return set(_unpack(data))
+    return msgpack.ExtType(code, data)
+
+
+def _pack(value: Any) -> bytes:
+    return msgpack.packb(value, default=_pack_default)
+
+
+def _unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, ext_hook=_unpack_ext)
+
+
+def _add_projection(kwargs: Dict[str, Any], projection: List[str] = None) -> None:
+    """Limit a query/scan to the attributes in projection"""
+    if projection:
+        # Placeholders keep reserved words usable as attribute names
+        names = {f"#p{i}": name for i, name in enumerate(projection)}
+        kwargs["ProjectionExpression"] = ", ".join(names)
+        kwargs.setdefault("ExpressionAttributeNames", {}).update(names)
+
 
 class DynamoDBClient:
     def __init__(self):
@@ -17,28 +141,61 @@ class DynamoDBClient:
         self.aws_region = os.getenv("AWS_REGION", "us-east-1")
         self.table_name = os.getenv("EVENTS_TABLE_NAME")
 
-        # Initialize DynamoDB client
-        self.dynamodb = boto3.client(
-            "dynamodb",
+        # One session and one client config so the resource and the low-level
+        # client share a credential chain and pool/retry settings
+        self.session = boto3.session.Session(
             aws_access_key_id=self.aws_access_key_id,
             aws_secret_access_key=self.aws_secret_access_key,
             region_name=self.aws_region,
         )
+        self.config = Config(
+            max_pool_connections=MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": MAX_RETRY_ATTEMPTS, "mode": "adaptive"},
+            tcp_keepalive=True,
+            connect_timeout=CONNECT_TIMEOUT,
+            read_timeout=READ_TIMEOUT,
+        )
 
         # Initialize DynamoDB resource for easier operations
-        self.dynamodb_resource = boto3.resource(
-            "dynamodb",
-            aws_access_key_id=self.aws_access_key_id,
-            aws_secret_access_key=self.aws_secret_access_key,
-            region_name=self.aws_region,
-        )
+        self.dynamodb_resource = self.session.resource("dynamodb", config=self.config)
+
+        # Low-level client for typed-attribute calls (transactions)
+        self.dynamodb = self.session.client("dynamodb", config=self.config)
 
         if self.table_name:
             self.table = self.dynamodb_resource.Table(self.table_name)
         else:
             self.table = None
 
-    def test_connection(self) -> Dict[str, Any]:
+        # boto3 is blocking, so calls run on a dedicated thread pool to keep
+        # the event loop free while waiting on DynamoDB
+        self.executor = ThreadPoolExecutor(
+            max_workers=MAX_POOL_CONNECTIONS, thread_name_prefix="dynamodb"
+        )
+
+        # Optional Redis cache for scan results, shared across workers
+        redis_url = os.getenv("REDIS_URL")
+        self.redis = aioredis.Redis.from_url(redis_url) if redis_url else None
+
+        # Names of the table's queryable GSIs, loaded on first use
+        self._index_names = None
+        self._index_names_at = 0.0
+
+        # Venue items keyed by venue_id
+        self.venue_cache = TTLCache(maxsize=VENUE_CACHE_SIZE, ttl=VENUE_CACHE_TTL)
+
+    async def _run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking boto3 call on the client's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def close(self) -> None:
+        """Release the thread pool and any cache connections"""
+        self.executor.shutdown(wait=False)
+        if self.redis is not None:
+            await self.redis.aclose()
+
+    async def test_connection(self) -> Dict[str, Any]:
         """Test DynamoDB connection and return table info"""
         if not self.table_name:
             return {
@@ -47,7 +204,9 @@ class DynamoDBClient:
             }
 
         try:
-            response = self.dynamodb.describe_table(TableName=self.table_name)
+            response = await self._run(
+                self.dynamodb.describe_table, TableName=self.table_name
+            )
             return {
                 "status": "connected",
                 "table_name": self.table_name,
@@ -57,18 +216,45 @@ class DynamoDBClient:
         except ClientError as e:
             return {"status": "error", "error": str(e)}
 
-    def put_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+    async def has_index(self, index_name: str) -> bool:
+        """Check whether the table has a given GSI ready to query (the index
+        list is re-read every INDEX_NAMES_TTL seconds, so an index created
+        later is picked up without a restart)"""
+        if (
+            self._index_names is None
+            or time.monotonic() - self._index_names_at > INDEX_NAMES_TTL
+        ):
+            try:
+                response = await self._run(
+                    self.dynamodb.describe_table, TableName=self.table_name
+                )
+            except ClientError:
+                return False
+            # An index still backfilling can't be queried yet
+            self._index_names = {
+                index["IndexName"]
+                for index in response["Table"].get("GlobalSecondaryIndexes", [])
+                if index.get("IndexStatus") == "ACTIVE"
+            }
+            self._index_names_at = time.monotonic()
+        return index_name in self._index_names
+
+    async def put_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Put item into DynamoDB table"""
         try:
-            response = self.table.put_item(Item=item)
+            response = await self._run(self.table.put_item, Item=item)
+            if item.get("sk") == "VENUE":
+                self.venue_cache.pop(item.get("pk"), None)
+            elif item.get("sk") == "EVENT":
+                await self.invalidate_scan_cache("events")
             return {"status": "success", "response": response}
         except ClientError as e:
             return {"status": "error", "error": str(e)}
 
-    def get_item(self, pk: str, sk: str) -> Dict[str, Any]:
+    async def get_item(self, pk: str, sk: str) -> Dict[str, Any]:
         """Get item from DynamoDB table"""
         try:
-            response = self.table.get_item(Key={"pk": pk, "sk": sk})
+            response = await self._run(self.table.get_item, Key={"pk": pk, "sk": sk})
             if "Item" in response:
                 return {"status": "success", "item": response["Item"]}
             else:
@@ -76,88 +262,582 @@ class DynamoDBClient:
         except ClientError as e:
             return {"status": "error", "error": str(e)}
 
-    def query_items(self, pk: str, sk_condition: str = None) -> Dict[str, Any]:
-        """Query items by partition key"""
-        try:
-            if sk_condition:
-                response = self.table.query(
-                    KeyConditionExpression="pk = :pk AND begins_with(sk, :sk)",
-                    ExpressionAttributeValues={":pk": pk, ":sk": sk_condition},
-                )
+    async def get_venue(self, venue_id: str) -> Dict[str, Any]:
+        """Get a venue item, served from the in-process cache when fresh"""
+        venue = self.venue_cache.get(venue_id)
+        if venue is not None:
+            return {"status": "success", "item": venue}
+
+        result = await self.get_item(venue_id, "VENUE")
+        if result["status"] == "success":
+            self.venue_cache[venue_id] = result["item"]
+        return result
+
+    async def batch_get_venues(self, venue_ids: Iterable[str]) -> Dict[str, Any]:
+        """Get venues by ID, batch-reading only those missing from the cache"""
+        venues = {}
+        missing = []
+        for venue_id in dict.fromkeys(venue_ids):
+            venue = self.venue_cache.get(venue_id)
+            if venue is not None:
+                venues[venue_id] = venue
             else:
-                response = self.table.query(
-                    KeyConditionExpression="pk = :pk",
-                    ExpressionAttributeValues={":pk": pk},
-                )
+                missing.append(venue_id)
+
+        if missing:
+            result = await self.batch_get_items(
+                [(venue_id, "VENUE") for venue_id in missing]
+            )
+            if result["status"] == "error":
+                return result
 
+            for venue in result["items"]:
+                self.venue_cache[venue["pk"]] = venue
+                venues[venue["pk"]] = venue
+
+        return {"status": "success", "venues": venues}
+
+    async def _iter_items(
+        self, operation: Callable[..., Dict[str, Any]], **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield items from a table query/scan, following LastEvaluatedKey"""
+        while True:
+            response = await self._run(operation, **kwargs)
+            for item in response["Items"]:
+                yield item
+
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+
+    async def _collect(
+        self, operation: Callable[..., Dict[str, Any]], **kwargs
+    ) -> Dict[str, Any]:
+        """Read every page of a table query/scan into a result dict"""
+        try:
+            items = [item async for item in self._iter_items(operation, **kwargs)]
+            return {"status": "success", "items": items, "count": len(items)}
+        except ClientError as e:
+            return {"status": "error", "error": str(e)}
+
+    def _query_kwargs(
+        self,
+        pk: str,
+        sk_condition: str = None,
+        filter_expression: str = None,
+        expression_values: Dict[str, Any] = None,
+        expression_names: Dict[str, str] = None,
+        projection: List[str] = None,
+    ) -> Dict[str, Any]:
+        if sk_condition:
+            query_kwargs = {
+                "KeyConditionExpression": "pk = :pk AND begins_with(sk, :sk)",
+                "ExpressionAttributeValues": {":pk": pk, ":sk": sk_condition},
+            }
+        else:
+            query_kwargs = {
+                "KeyConditionExpression": "pk = :pk",
+                "ExpressionAttributeValues": {":pk": pk},
+            }
+        if filter_expression and expression_values:
+            query_kwargs["FilterExpression"] = filter_expression
+            query_kwargs["ExpressionAttributeValues"].update(expression_values)
+            if expression_names:
+                query_kwargs["ExpressionAttributeNames"] = dict(expression_names)
+        _add_projection(query_kwargs, projection)
+        return query_kwargs
+
+    def _scan_kwargs(
+        self,
+        filter_expression: str = None,
+        expression_values: Dict[str, Any] = None,
+        expression_names: Dict[str, str] = None,
+        projection: List[str] = None,
+    ) -> Dict[str, Any]:
+        scan_kwargs = {}
+        if filter_expression and expression_values:
+            scan_kwargs["FilterExpression"] = filter_expression
+            scan_kwargs["ExpressionAttributeValues"] = expression_values
+            if expression_names:
+                scan_kwargs["ExpressionAttributeNames"] = dict(expression_names)
+        _add_projection(scan_kwargs, projection)
+        return scan_kwargs
+
+    async def query_items(
+        self,
+        pk: str,
+        sk_condition: str = None,
+        filter_expression: str = None,
+        expression_values: Dict[str, Any] = None,
+        projection: List[str] = None,
+    ) -> Dict[str, Any]:
+        """Query items by partition key, optionally filtered server-side and
+        limited to the attributes in projection"""
+        return await self._collect(
+            self.table.query,
+            **self._query_kwargs(
+                pk,
+                sk_condition,
+                filter_expression,
+                expression_values,
+                projection=projection,
+            ),
+        )
+
+    async def query_page(
+        self,
+        pk: str,
+        sk_condition: str = None,
+        limit: int = 100,
+        start_key: Dict[str, Any] = None,
+        descending: bool = False,
+        filter_expression: str = None,
+        expression_values: Dict[str, Any] = None,
+        expression_names: Dict[str, str] = None,
+        projection: List[str] = None,
+    ) -> Dict[str, Any]:
+        """Query up to limit matching items, with the key to resume after them"""
+        kwargs = self._query_kwargs(
+            pk,
+            sk_condition,
+            filter_expression,
+            expression_values,
+            expression_names,
+            projection,
+        )
+        kwargs["ScanIndexForward"] = not descending
+        return await self._page(limit, start_key, **kwargs)
+
+    async def query_events_page(
+        self,
+        limit: int,
+        start_key: Dict[str, Any] = None,
+        projection: List[str] = None,
+    ) -> Dict[str, Any]:
+        """Query up to limit events from the entity type GSI, latest start_time
+        first, with the key to resume after them"""
+        query_kwargs = {
+            "IndexName": EVENTS_BY_TYPE_INDEX,
+            "KeyConditionExpression": "entity_type = :entity_type",
+            "ExpressionAttributeValues": {":entity_type": EVENT_ENTITY_TYPE},
+            "ScanIndexForward": False,
+        }
+        _add_projection(query_kwargs, projection)
+        return await self._page(limit, start_key, **query_kwargs)
+
+    async def _page(
+        self, limit: int, start_key: Dict[str, Any] = None, **kwargs
+    ) -> Dict[str, Any]:
+        """Run a query until limit items match, returning the resume key"""
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+
+        items = []
+        last_key = None
+        try:
+            while len(items) < limit:
+                # Limit caps items evaluated, so a filtered page never overshoots
+                kwargs["Limit"] = limit - len(items)
+                response = await self._run(self.table.query, **kwargs)
+                items.extend(response["Items"])
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
             return {
                 "status": "success",
-                "items": response["Items"],
-                "count": response["Count"],
+                "items": items,
+                "count": len(items),
+                "last_key": last_key,
             }
         except ClientError as e:
             return {"status": "error", "error": str(e)}
 
-    def scan_items(
+    async def query_last_item(
+        self, pk: str, sk_condition: str, projection: str = None
+    ) -> Dict[str, Any]:
+        """Get the item with the greatest sort key matching a prefix"""
+        query_kwargs = self._query_kwargs(pk, sk_condition)
+        if projection:
+            query_kwargs["ProjectionExpression"] = projection
+        try:
+            response = await self._run(
+                self.table.query, ScanIndexForward=False, Limit=1, **query_kwargs
+            )
+
+            items = response["Items"]
+            return {"status": "success", "item": items[0] if items else None}
+        except ClientError as e:
+            return {"status": "error", "error": str(e)}
+
+    async def query_count(self, pk: str, limit: int = None) -> Dict[str, Any]:
+        """Count the items under a partition key without returning them,
+        stopping once limit items have been counted"""
+        kwargs = self._query_kwargs(pk)
+        kwargs["Select"] = "COUNT"
+        try:
+            count = 0
+            while limit is None or count < limit:
+                if limit is not None:
+                    kwargs["Limit"] = limit - count
+                response = await self._run(self.table.query, **kwargs)
+                count += response["Count"]
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+            return {"status": "success", "count": count}
+        except ClientError as e:
+            return {"status": "error", "error": str(e)}
+
+    async def count_bookings_by_state(
+        self, event_id: str, state: str
+    ) -> Dict[str, Any]:
+        """Count an event's bookings in a state via the bookings-by-state index"""
+        kwargs = {
+            "IndexName": BOOKINGS_BY_STATE_INDEX,
+            "KeyConditionExpression": "event_state = :event_state",
+            "ExpressionAttributeValues": {
+                ":event_state": booking_state_key(event_id, state)
+            },
+            "Select": "COUNT",
+        }
+        try:
+            count = 0
+            while True:
+                response = await self._run(self.table.query, **kwargs)
+                count += response["Count"]
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    return {"status": "success", "count": count}
+                kwargs["ExclusiveStartKey"] = last_key
+        except ClientError as e:
+            return {"status": "error", "error": str(e)}
+
+    def query_iter(
+        self,
+        pk: str,
+        sk_condition: str = None,
+        filter_expression: str = None,
+        expression_values: Dict[str, Any] = None,
+        projection: List[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over items by partition key, one page in memory at a time"""
+        return self._iter_items(
+            self.table.query,
+            **self._query_kwargs(
+                pk,
+                sk_condition,
+                filter_expression,
+                expression_values,
+                projection=projection,
+            ),
+        )
+
+    async def scan_items(
+        self,
+        filter_expression: str = None,
+        expression_values: Dict[str, Any] = None,
+        expression_names: Dict[str, str] = None,
+        segments: int = 1,
+        projection: List[str] = None,
+    ) -> Dict[str, Any]:
+        """Scan all items in the table with optional filter, split into
+        concurrently read segments when segments > 1"""
+        scan_kwargs = self._scan_kwargs(
+            filter_expression, expression_values, expression_names, projection
+        )
+        if segments <= 1:
+            return await self._collect(self.table.scan, **scan_kwargs)
+
+        results = await asyncio.gather(
+            *(
+                self._collect(
+                    self.table.scan,
+                    Segment=segment,
+                    TotalSegments=segments,
+                    **scan_kwargs,
+                )
+                for segment in range(segments)
+            )
+        )
+        items = []
+        for result in results:
+            if result["status"] == "error":
+                return result
+            items.extend(result["items"])
+        return {"status": "success", "items": items, "count": len(items)}
+
+    def scan_iter(
+        self,
+        filter_expression: str = None,
+        expression_values: Dict[str, Any] = None,
+        expression_names: Dict[str, str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over scanned items, one page in memory at a time"""
+        return self._iter_items(
+            self.table.scan,
+            **self._scan_kwargs(filter_expression, expression_values, expression_names),
+        )
+
+    async def scan_items_cached(
         self,
+        key_prefix: str,
         filter_expression: str = None,
         expression_values: Dict[str, Any] = None,
         expression_names: Dict[str, str] = None,
+        segments: int = 1,
+        projection: List[str] = None,
     ) -> Dict[str, Any]:
-        """Scan all items in the table with optional filter"""
+        """Scan through the Redis cache when one is configured"""
+        if self.redis is None:
+            return await self.scan_items(
+                filter_expression,
+                expression_values,
+                expression_names,
+                segments,
+                projection,
+            )
+
+        digest = hashlib.sha1(
+            repr(
+                (filter_expression, expression_values, expression_names, projection)
+            ).encode()
+        ).hexdigest()
+
+        # A Redis outage falls back to DynamoDB rather than failing the request
+        key = None
         try:
-            scan_kwargs = {}
-            if filter_expression and expression_values:
-                scan_kwargs["FilterExpression"] = filter_expression
-                scan_kwargs["ExpressionAttributeValues"] = expression_values
-                if expression_names:
-                    scan_kwargs["ExpressionAttributeNames"] = expression_names
+            # Keys carry the prefix's version, so a bump orphans older entries
+            # (left to expire) and a scan racing a write caches under the
+            # version it read, which is already stale
+            version = await self.redis.get(f"{key_prefix}:version")
+            key = f"{key_prefix}:v{int(version or 0)}:{digest}"
+            cached = await self.redis.get(key)
+            if cached is not None:
+                return _unpack(cached)
+        except redis.RedisError:
+            pass
 
-            response = self.table.scan(**scan_kwargs)
+        result = await self.scan_items(
+            filter_expression,
+            expression_values,
+            expression_names,
+            segments,
+            projection,
+        )
+        if result["status"] == "success" and key is not None:
+            try:
+                await self.redis.setex(key, SCAN_CACHE_TTL, _pack(result))
+            except redis.RedisError:
+                pass
+        return result
 
-            return {
-                "status": "success",
-                "items": response["Items"],
-                "count": response["Count"],
-            }
+    async def invalidate_scan_cache(self, key_prefix: str) -> None:
+        """Retire every cached scan stored under key_prefix by bumping its
+        version (one INCR, however many entries are cached)"""
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.incr(f"{key_prefix}:version")
+        except redis.RedisError:
+            pass
+
+    async def batch_get_items(
+        self, keys: List[Tuple[str, str]], projection: List[str] = None
+    ) -> Dict[str, Any]:
+        """Get multiple items by (pk, sk) using concurrent BatchGetItem calls,
+        optionally limited to the attributes in projection (plus the keys)"""
+        if projection:
+            # The keys are needed to put the items back in request order
+            projection = ["pk", "sk"] + [
+                name for name in projection if name not in ("pk", "sk")
+            ]
+        try:
+            # BatchGetItem rejects duplicate keys
+            unique_keys = list(dict.fromkeys(keys))
+            chunks = [
+                unique_keys[i : i + BATCH_GET_LIMIT]
+                for i in range(0, len(unique_keys), BATCH_GET_LIMIT)
+            ]
+            results = await asyncio.gather(
+                *(self._batch_get_chunk(chunk, projection) for chunk in chunks)
+            )
+
+            # Reassemble in the order the keys were requested
+            found = {}
+            for chunk_items in results:
+                for item in chunk_items:
+                    found[(item["pk"], item["sk"])] = item
+            items = [found[key] for key in unique_keys if key in found]
+
+            return {"status": "success", "items": items, "count": len(items)}
+        except ClientError as e:
+            return {"status": "error", "error": str(e)}
+
+    async def _batch_get_chunk(
+        self, keys: List[Tuple[str, str]], projection: List[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch up to 100 keys, retrying unprocessed keys with backoff"""
+        table_request = {"Keys": [{"pk": pk, "sk": sk} for pk, sk in keys]}
+        _add_projection(table_request, projection)
+        request_items = {self.table_name: table_request}
+        items = []
+        for attempt in range(BATCH_MAX_RETRIES):
+            response = await self._run(
+                self.dynamodb_resource.batch_get_item, RequestItems=request_items
+            )
+            items.extend(response["Responses"].get(self.table_name, []))
+
+            request_items = response.get("UnprocessedKeys")
+            if not request_items:
+                return items
+            await asyncio.sleep(0.05 * 2**attempt)
+
+        raise ClientError(
+            {
+                "Error": {
+                    "Code": "UnprocessedKeys",
+                    "Message": "Keys still unprocessed after retries",
+                }
+            },
+            "BatchGetItem",
+        )
+
+    async def batch_write_items(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Put multiple items using concurrent BatchWriteItem calls"""
+        try:
+            chunks = [
+                items[i : i + BATCH_WRITE_LIMIT]
+                for i in range(0, len(items), BATCH_WRITE_LIMIT)
+            ]
+            await asyncio.gather(*(self._batch_write_chunk(chunk) for chunk in chunks))
+            return {"status": "success", "count": len(items)}
         except ClientError as e:
             return {"status": "error", "error": str(e)}
 
-    def transact_write(self, transact_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _batch_write_chunk(self, items: List[Dict[str, Any]]) -> None:
+        """Put up to 25 items, retrying unprocessed items with backoff"""
+        request_items = {
+            self.table_name: [{"PutRequest": {"Item": item}} for item in items]
+        }
+        for attempt in range(BATCH_MAX_RETRIES):
+            response = await self._run(
+                self.dynamodb_resource.batch_write_item, RequestItems=request_items
+            )
+
+            request_items = response.get("UnprocessedItems")
+            if not request_items:
+                return
+            await asyncio.sleep(0.05 * 2**attempt)
+
+        raise ClientError(
+            {
+                "Error": {
+                    "Code": "UnprocessedItems",
+                    "Message": "Items still unprocessed after retries",
+                }
+            },
+            "BatchWriteItem",
+        )
+
+    async def transact_write(
+        self, transact_items: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
         """Execute a transactional write operation"""
         try:
-            response = self.dynamodb.transact_write_items(TransactItems=transact_items)
+            response = await self._run(
+                self.dynamodb.transact_write_items, TransactItems=transact_items
+            )
             return {"status": "success", "response": response}
         except ClientError as e:
-            return {"status": "error", "error": str(e)}
+            # A cancelled transaction reports one reason per item, in order
+            return {
+                "status": "error",
+                "error": str(e),
+                "cancellation_reasons": e.response.get("CancellationReasons", []),
+            }
 
-    def query_gsi(
+    async def query_gsi(
         self, gsi_name: str, pk: str, sk_condition: str = None
     ) -> Dict[str, Any]:
         """Query items using a Global Secondary Index"""
-        try:
-            if sk_condition:
-                response = self.table.query(
-                    IndexName=gsi_name,
-                    KeyConditionExpression="user_id = :pk AND begins_with(booking_date, :sk)",
-                    ExpressionAttributeValues={":pk": pk, ":sk": sk_condition},
-                )
-            else:
-                response = self.table.query(
-                    IndexName=gsi_name,
-                    KeyConditionExpression="user_id = :pk",
-                    ExpressionAttributeValues={":pk": pk},
-                )
+        if sk_condition:
+            return await self._collect(
+                self.table.query,
+                IndexName=gsi_name,
+                KeyConditionExpression=(
+                    "user_id = :pk AND begins_with(booking_date, :sk)"
+                ),
+                ExpressionAttributeValues={":pk": pk, ":sk": sk_condition},
+            )
+        return await self._collect(
+            self.table.query,
+            IndexName=gsi_name,
+            KeyConditionExpression="user_id = :pk",
+            ExpressionAttributeValues={":pk": pk},
+        )
 
-            return {
-                "status": "success",
-                "items": response["Items"],
-                "count": response["Count"],
+    async def query_record(self, record_id: str) -> Dict[str, Any]:
+        """Query a holding or booking by its ID via the record ID GSI"""
+        return await self._collect(
+            self.table.query,
+            IndexName=RECORDS_BY_ID_INDEX,
+            KeyConditionExpression="record_id = :record_id",
+            ExpressionAttributeValues={":record_id": record_id},
+        )
+
+    async def query_events(self, projection: List[str] = None) -> Dict[str, Any]:
+        """Query every event via the entity type GSI, latest start_time first"""
+        query_kwargs = {
+            "IndexName": EVENTS_BY_TYPE_INDEX,
+            "KeyConditionExpression": "entity_type = :entity_type",
+            "ExpressionAttributeValues": {":entity_type": EVENT_ENTITY_TYPE},
+            "ScanIndexForward": False,
+        }
+        _add_projection(query_kwargs, projection)
+        return await self._collect(self.table.query, **query_kwargs)
+
+    async def query_venues(
+        self, city: str = None, projection: List[str] = None
+    ) -> Dict[str, Any]:
+        """Query venues (optionally in one city, case-insensitively) via the
+        entity city GSI"""
+        if city:
+            query_kwargs = {
+                "IndexName": ENTITIES_BY_CITY_INDEX,
+                "KeyConditionExpression": (
+                    "entity_type = :entity_type AND city_key = :city"
+                ),
+                "ExpressionAttributeValues": {
+                    ":entity_type": VENUE_ENTITY_TYPE,
+                    ":city": city_key(city),
+                },
             }
-        except ClientError as e:
-            return {"status": "error", "error": str(e)}
+        else:
+            query_kwargs = {
+                "IndexName": ENTITIES_BY_CITY_INDEX,
+                "KeyConditionExpression": "entity_type = :entity_type",
+                "ExpressionAttributeValues": {":entity_type": VENUE_ENTITY_TYPE},
+            }
+        _add_projection(query_kwargs, projection)
+        return await self._collect(self.table.query, **query_kwargs)
 
-    def update_item_conditional(
+    async def query_events_by_city(
+        self, city: str, projection: List[str] = None
+    ) -> Dict[str, Any]:
+        """Query events whose venue is in the given city via the city GSI"""
+        query_kwargs = {
+            "IndexName": EVENTS_BY_CITY_INDEX,
+            "KeyConditionExpression": "city_key = :city",
+            "ExpressionAttributeValues": {":city": city_key(city)},
+        }
+        _add_projection(query_kwargs, projection)
+        return await self._collect(self.table.query, **query_kwargs)
+
+    async def update_item_conditional(
         self,
         pk: str,
         sk: str,
@@ -167,7 +847,8 @@ class DynamoDBClient:
     ) -> Dict[str, Any]:
         """Update item with conditional expression"""
         try:
-            response = self.table.update_item(
+            response = await self._run(
+                self.table.update_item,
                 Key={"pk": pk, "sk": sk},
                 UpdateExpression=update_expression,
                 ConditionExpression=condition_expression,
@@ -178,5 +859,100 @@ class DynamoDBClient:
             return {"status": "error", "error": str(e)}
 
 
+class CachedDynamoDBClient(DynamoDBClient):
+    """DynamoDBClient with a short-lived in-process cache for point reads"""
+
+    # Writes through this client invalidate the keys they touch, so only writes
+    # from other processes can be served stale, and only for the TTL
+
+    def __init__(self):
+        super().__init__()
+        self.item_cache = TTLCache(maxsize=ITEM_CACHE_SIZE, ttl=ITEM_CACHE_TTL)
+        self.gsi_cache = TTLCache(maxsize=GSI_CACHE_SIZE, ttl=GSI_CACHE_TTL)
+
+        # Callbacks told the partition key of every write, for derived caches
+        self.write_listeners: List[Callable[[str], None]] = []
+
+    def add_write_listener(self, listener: Callable[[str], None]) -> None:
+        """Call listener with the pk of each item written through this client"""
+        self.write_listeners.append(listener)
+
+    async def get_item(self, pk: str, sk: str) -> Dict[str, Any]:
+        """Get item, served from the cache when fresh"""
+        cached = self.item_cache.get((pk, sk))
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        result = await super().get_item(pk, sk)
+        if result["status"] == "success":
+            self.item_cache[(pk, sk)] = copy.deepcopy(result)
+        return result
+
+    async def query_gsi(
+        self, gsi_name: str, pk: str, sk_condition: str = None
+    ) -> Dict[str, Any]:
+        """Query a GSI, served from the cache when fresh"""
+        key = (gsi_name, pk, sk_condition)
+        cached = self.gsi_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        result = await super().query_gsi(gsi_name, pk, sk_condition)
+        if result["status"] == "success":
+            self.gsi_cache[key] = copy.deepcopy(result)
+        return result
+
+    async def put_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        result = await super().put_item(item)
+        self._invalidate([(item.get("pk"), item.get("sk"))])
+        return result
+
+    async def update_item_conditional(
+        self,
+        pk: str,
+        sk: str,
+        update_expression: str,
+        condition_expression: str,
+        expression_values: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        result = await super().update_item_conditional(
+            pk, sk, update_expression, condition_expression, expression_values
+        )
+        self._invalidate([(pk, sk)])
+        return result
+
+    async def batch_write_items(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        result = await super().batch_write_items(items)
+        self._invalidate([(item["pk"], item["sk"]) for item in items])
+        return result
+
+    async def transact_write(
+        self, transact_items: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        keys = []
+
+        for transact_item in transact_items:
+            for operation in transact_item.values():
+                # Put carries the full item, Update/Delete/ConditionCheck a Key
+                key = operation.get("Key") or operation.get("Item") or {}
+                if "pk" in key and "sk" in key:
+                    keys.append((key["pk"]["S"], key["sk"]["S"]))
+
+        result = await super().transact_write(transact_items)
+        self._invalidate(keys)
+        return result
+
+    def _invalidate(self, keys: List[Tuple[str, str]]) -> None:
+        """Drop cached reads that a write to keys could change"""
+        for key in keys:
+            self.item_cache.pop(key, None)
+        # GSI results can't be mapped back to table keys, so drop them all
+        self.gsi_cache.clear()
+
+        for pk in {pk for pk, _ in keys}:
+            for listener in self.write_listeners:
+                listener(pk)
+
+
 # Global database client instance
-db_client = DynamoDBClient()
+db_client = CachedDynamoDBClient()
@@ -1,26 +1,48 @@
 import re
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set
 
+from rapidfuzz import fuzz, process
 
+# Timezone assumed for naive dates, resolved once at import
+LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+# Returns whether an event passes a filter
+EventPredicate = Callable[[Dict[str, Any]], bool]
+
+# Above this many candidates, fuzzy scoring is spread across all CPU cores
+PARALLEL_SCORING_THRESHOLD = 500
+
+# Date formats accepted by parse_date_filter when the ISO fast path fails
+DATE_FORMATS = (
+    "%Y-%m-%d",  # 2024-12-25
+    "%d-%m-%Y",  # 25-12-2024
+    "%m/%d/%Y",  # 12/25/2024
+    "%d/%m/%Y",  # 25/12/2024
+    "%Y-%m-%d %H:%M",  # 2024-12-25 19:00
+    "%Y-%m-%dT%H:%M:%S",  # 2024-12-25T19:00:00
+    "%Y-%m-%dT%H:%M:%SZ",  # 2024-12-25T19:00:00Z
+)
+
+
+@lru_cache(maxsize=4096)
 def parse_date_filter(date_str: str) -> Optional[datetime]:
     """Parse various date formats and return datetime object"""
     if not date_str:
         return None
 
-    # Common date formats to try
-    date_formats = [
-        "%Y-%m-%d",  # 2024-12-25
-        "%d-%m-%Y",  # 25-12-2024
-        "%m/%d/%Y",  # 12/25/2024
-        "%d/%m/%Y",  # 25/12/2024
-        "%Y-%m-%d %H:%M",  # 2024-12-25 19:00
-        "%Y-%m-%dT%H:%M:%S",  # 2024-12-25T19:00:00
-        "%Y-%m-%dT%H:%M:%SZ",  # 2024-12-25T19:00:00Z
-    ]
+    # Most inputs are ISO 8601 (2024-12-25, 2024-12-25 19:00, ...), so try the
+    # C parser first. A trailing "Z" is left to the format list, which parses
+    # it as a naive datetime like before.
+    if not date_str.endswith("Z"):
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
 
-    for fmt in date_formats:
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt)
         except ValueError:
@@ -39,9 +61,11 @@ def similarity_score(a: str, b: str) -> float:
         return 0.0
 
     # Convert to lowercase for case-insensitive comparison
-    a_lower = a.lower().strip()
-    b_lower = b.lower().strip()
+    return _normalized_similarity(a.lower().strip(), b.lower().strip())
 
+
+def _normalized_similarity(a_lower: str, b_lower: str) -> float:
+    """Similarity score for strings that are already lowercased and stripped"""
     # Exact match
     if a_lower == b_lower:
         return 1.0
@@ -50,8 +74,25 @@ def similarity_score(a: str, b: str) -> float:
     if a_lower in b_lower or b_lower in a_lower:
         return 0.8
 
-    # Use SequenceMatcher for fuzzy matching
-    return SequenceMatcher(None, a_lower, b_lower).ratio()
+    # Use RapidFuzz for fuzzy matching
+    return fuzz.ratio(a_lower, b_lower) / 100.0
+
+
+def prepare_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach precomputed lowercase search fields to an event dict"""
+    searchable_text = [
+        event.get("name", ""),
+        event.get("description", ""),
+        " ".join(event.get("artists", [])),
+        " ".join(event.get("tags", [])),
+    ]
+    event["_search_blob"] = " ".join(searchable_text).lower().strip()
+    event["_name_lower"] = event.get("name", "").lower()
+
+    # Cheapest seat price, used by the price filter and price sort
+    seat_prices = event.get("seat_type_prices")
+    event["_min_price"] = min(seat_prices.values()) if seat_prices else None
+    return event
 
 
 def find_similar_items(
@@ -61,15 +102,154 @@ def find_similar_items(
     if not search_term or not items:
         return []
 
-    similar_items = []
-    for item in items:
-        score = similarity_score(search_term, item)
-        if score >= threshold:
-            similar_items.append(item)
+    query = search_term.lower().strip()
+
+    # Score every item in a single RapidFuzz call
+    matches = process.extract(
+        query,
+        items,
+        scorer=fuzz.ratio,
+        processor=lambda x: x.lower().strip(),
+        limit=None,
+    )
+
+    scored_items = []
+    for item, score, index in matches:
+        candidate = item.lower().strip()
+        if not candidate:
+            continue
+
+        # Keep the exact/substring boosts from similarity_score
+        if candidate == query:
+            score = 100.0
+        elif candidate in query or query in candidate:
+            score = 80.0
 
-    # Sort by similarity score (highest first)
-    similar_items.sort(key=lambda x: similarity_score(search_term, x), reverse=True)
-    return similar_items
+        if score >= threshold * 100:
+            scored_items.append((score, index, item))
+
+    # Sort by similarity score (highest first), keeping input order for ties
+    scored_items.sort(key=lambda x: (-x[0], x[1]))
+    return [item for _, _, item in scored_items]
+
+
+def _ratio_scores(query: str, candidates: List[str]) -> List[float]:
+    """fuzz.ratio of query against each candidate, in candidate order"""
+    if len(candidates) > PARALLEL_SCORING_THRESHOLD:
+        # cdist runs in C without the GIL, split across worker threads
+        scores = process.cdist(
+            [query], candidates, scorer=fuzz.ratio, dtype="float64", workers=-1
+        )
+        return scores[0].tolist()
+
+    return [fuzz.ratio(query, candidate) for candidate in candidates]
+
+
+def _matching_values(query: str, values: List[str], threshold: float) -> Set[str]:
+    """Return the lowercased values that match a lowercased, stripped query"""
+    # Score each distinct value once, however many events share it
+    candidates = list({value.lower().strip() for value in values} - {""})
+    scores = _ratio_scores(query, candidates)
+
+    matching = set()
+    for candidate, score in zip(candidates, scores):
+        # Keep the exact/substring boosts from similarity_score
+        if candidate == query:
+            score = 100.0
+        elif candidate in query or query in candidate:
+            score = 80.0
+
+        if score >= threshold * 100:
+            matching.add(candidate)
+
+    return matching
+
+
+def _similar_values_predicate(
+    events: List[Dict[str, Any]], field_name: str, query: str, threshold: float
+) -> EventPredicate:
+    """Match events where any string in event[field_name] is similar to query"""
+    matching = _matching_values(
+        query.lower().strip(),
+        [value for event in events for value in event.get(field_name, [])],
+        threshold,
+    )
+    return lambda event: any(
+        value.lower().strip() in matching for value in event.get(field_name, [])
+    )
+
+
+def _date_predicate(date_filter: str, filter_type: str) -> Optional[EventPredicate]:
+    """Match events relative to a date, or None if the date can't be parsed"""
+    filter_date = parse_date_filter(date_filter)
+    if not filter_date:
+        return None
+
+    # Make filter_date timezone-aware (UTC)
+    if filter_date.tzinfo is None:
+        filter_date = filter_date.replace(tzinfo=LOCAL_TZ)
+
+    def predicate(event: Dict[str, Any]) -> bool:
+        # Parse each event's start time once per event dict
+        if "_start_dt" not in event:
+            event["_start_dt"] = _parse_event_time(event.get("start_time"))
+        event_date = event["_start_dt"]
+        if event_date is None:
+            return False
+
+        if filter_type == "after":
+            return event_date >= filter_date
+        elif filter_type == "before":
+            return event_date <= filter_date
+        elif filter_type == "on":
+            return event_date.date() == filter_date.date()
+        return False
+
+    return predicate
+
+
+def city_matches(city_query: str, city: str) -> bool:
+    """Whether a city is similar enough to city_query for the city filter"""
+    city = city.lower()
+    return city_query.lower() in city or similarity_score(city_query, city) >= 0.3
+
+
+def _city_predicate(
+    city_query: str, venue_cache: Dict[str, Dict[str, Any]]
+) -> EventPredicate:
+    """Match events whose cached venue is in a city similar to city_query"""
+    # Score each venue's city once rather than once per event
+    matching_venue_ids = {
+        venue_id
+        for venue_id, venue in venue_cache.items()
+        if venue and city_matches(city_query, venue.get("city", ""))
+    }
+
+    return lambda event: event.get("venue_id") in matching_venue_ids
+
+
+def _price_predicate(
+    min_price: Optional[float], max_price: Optional[float]
+) -> EventPredicate:
+    """Match events whose cheapest seat is within the price range"""
+
+    def predicate(event: Dict[str, Any]) -> bool:
+        if "_min_price" not in event:
+            prepare_event(event)
+
+        # Events without seat prices never match a price range
+        event_min_price = event["_min_price"]
+        if event_min_price is None:
+            return False
+
+        # Check if price is within range
+        if min_price is not None and event_min_price < min_price:
+            return False
+        if max_price is not None and event_min_price > max_price:
+            return False
+        return True
+
+    return predicate
 
 
 def filter_events_by_date(
@@ -79,41 +259,27 @@ def filter_events_by_date(
     if not date_filter:
         return events
 
-    filter_date = parse_date_filter(date_filter)
-    if not filter_date:
+    predicate = _date_predicate(date_filter, filter_type)
+    if predicate is None:
         return events
 
-    # Make filter_date timezone-aware (UTC)
-    if filter_date.tzinfo is None:
-        filter_date = filter_date.replace(tzinfo=datetime.now().astimezone().tzinfo)
+    return [event for event in events if predicate(event)]
 
-    filtered_events = []
-    for event in events:
-        try:
-            event_time_str = event["start_time"]
-            # Handle different timezone formats
-            if event_time_str.endswith("Z"):
-                event_date = datetime.fromisoformat(
-                    event_time_str.replace("Z", "+00:00")
-                )
-            elif "+" in event_time_str or event_time_str.endswith("00:00"):
-                event_date = datetime.fromisoformat(event_time_str)
-            else:
-                # Assume UTC if no timezone info
-                event_date = datetime.fromisoformat(event_time_str).replace(
-                    tzinfo=datetime.now().astimezone().tzinfo
-                )
-
-            if filter_type == "after" and event_date >= filter_date:
-                filtered_events.append(event)
-            elif filter_type == "before" and event_date <= filter_date:
-                filtered_events.append(event)
-            elif filter_type == "on" and event_date.date() == filter_date.date():
-                filtered_events.append(event)
-        except (ValueError, KeyError):
-            continue
 
-    return filtered_events
+@lru_cache(maxsize=4096)
+def _parse_event_time(event_time_str: Optional[str]) -> Optional[datetime]:
+    """Parse an event start_time into a timezone-aware datetime"""
+    try:
+        # Handle different timezone formats
+        if event_time_str.endswith("Z"):
+            return datetime.fromisoformat(event_time_str.replace("Z", "+00:00"))
+        elif "+" in event_time_str or event_time_str.endswith("00:00"):
+            return datetime.fromisoformat(event_time_str)
+        else:
+            # Assume UTC if no timezone info
+            return datetime.fromisoformat(event_time_str).replace(tzinfo=LOCAL_TZ)
+    except (ValueError, AttributeError):
+        return None
 
 
 def filter_events_by_artists(
@@ -123,18 +289,8 @@ def filter_events_by_artists(
     if not artist_query:
         return events
 
-    filtered_events = []
-    for event in events:
-        artists = event.get("artists", [])
-        if not artists:
-            continue
-
-        # Check if any artist matches the query
-        similar_artists = find_similar_items(artist_query, artists, threshold)
-        if similar_artists:
-            filtered_events.append(event)
-
-    return filtered_events
+    predicate = _similar_values_predicate(events, "artists", artist_query, threshold)
+    return [event for event in events if predicate(event)]
 
 
 def filter_events_by_tags(
@@ -144,18 +300,8 @@ def filter_events_by_tags(
     if not tag_query:
         return events
 
-    filtered_events = []
-    for event in events:
-        tags = event.get("tags", [])
-        if not tags:
-            continue
-
-        # Check if any tag matches the query
-        similar_tags = find_similar_items(tag_query, tags, threshold)
-        if similar_tags:
-            filtered_events.append(event)
-
-    return filtered_events
+    predicate = _similar_values_predicate(events, "tags", tag_query, threshold)
+    return [event for event in events if predicate(event)]
 
 
 def filter_events_by_city(
@@ -167,25 +313,8 @@ def filter_events_by_city(
     if not city_query:
         return events
 
-    filtered_events = []
-    for event in events:
-        venue_id = event.get("venue_id")
-        if not venue_id:
-            continue
-
-        # Get venue from cache or fetch if not cached
-        venue = venue_cache.get(venue_id)
-        if not venue:
-            continue
-
-        venue_city = venue.get("city", "").lower()
-        if (
-            city_query.lower() in venue_city
-            or similarity_score(city_query, venue_city) >= 0.3
-        ):
-            filtered_events.append(event)
-
-    return filtered_events
+    predicate = _city_predicate(city_query, venue_cache)
+    return [event for event in events if predicate(event)]
 
 
 def filter_events_by_price_range(
@@ -197,24 +326,8 @@ def filter_events_by_price_range(
     if min_price is None and max_price is None:
         return events
 
-    filtered_events = []
-    for event in events:
-        seat_prices = event.get("seat_type_prices", {})
-        if not seat_prices:
-            continue
-
-        # Get the minimum price for this event
-        event_min_price = min(seat_prices.values()) if seat_prices else 0
-
-        # Check if price is within range
-        if min_price is not None and event_min_price < min_price:
-            continue
-        if max_price is not None and event_min_price > max_price:
-            continue
-
-        filtered_events.append(event)
-
-    return filtered_events
+    predicate = _price_predicate(min_price, max_price)
+    return [event for event in events if predicate(event)]
 
 
 def search_events(
@@ -224,42 +337,124 @@ def search_events(
     if not search_query:
         return events
 
-    filtered_events = []
+    query = search_query.lower().strip()
+
+    # Search in name, description, artists, and tags
     for event in events:
-        # Search in name, description, artists, and tags
-        searchable_text = [
-            event.get("name", ""),
-            event.get("description", ""),
-            " ".join(event.get("artists", [])),
-            " ".join(event.get("tags", [])),
-        ]
+        if "_search_blob" not in event:
+            prepare_event(event)
+    blobs = [event["_search_blob"] for event in events]
+
+    # Only blobs that are neither exact nor substring matches need fuzzy scores
+    fuzzy_indexes = [
+        i
+        for i, blob in enumerate(blobs)
+        if blob and blob != query and blob not in query and query not in blob
+    ]
+    fuzzy_scores = dict(
+        zip(fuzzy_indexes, _ratio_scores(query, [blobs[i] for i in fuzzy_indexes]))
+    )
+
+    filtered_events = []
+    for i, event in enumerate(events):
+        search_blob = blobs[i]
+        if not search_blob:
+            continue
+
+        if search_blob == query:
+            score = 1.0
+        elif i in fuzzy_scores:
+            score = fuzzy_scores[i] / 100.0
+        else:
+            score = 0.8
 
-        combined_text = " ".join(searchable_text).lower()
-        if similarity_score(search_query, combined_text) >= threshold:
+        if score >= threshold:
             filtered_events.append(event)
 
     return filtered_events
 
 
+@dataclass
+class FilterSpec:
+    """Filters requested for an event listing (None means not filtered)"""
+
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    city: Optional[str] = None
+    venue_cache: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    artists: Optional[str] = None
+    tags: Optional[str] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    search: Optional[str] = None
+    threshold: float = 0.3
+
+
+def apply_filters(
+    events: List[Dict[str, Any]], spec: FilterSpec
+) -> List[Dict[str, Any]]:
+    """Apply every requested filter to events in a single pass"""
+    predicates = []
+
+    # Cheap comparisons first so fuzzy checks only see surviving events
+    if spec.start_date:
+        predicates.append(_date_predicate(spec.start_date, "after"))
+    if spec.end_date:
+        predicates.append(_date_predicate(spec.end_date, "before"))
+    if spec.min_price is not None or spec.max_price is not None:
+        predicates.append(_price_predicate(spec.min_price, spec.max_price))
+    if spec.city:
+        predicates.append(_city_predicate(spec.city, spec.venue_cache))
+    if spec.artists:
+        predicates.append(
+            _similar_values_predicate(events, "artists", spec.artists, spec.threshold)
+        )
+    if spec.tags:
+        predicates.append(
+            _similar_values_predicate(events, "tags", spec.tags, spec.threshold)
+        )
+
+    # Unparseable dates disable their filter, like filter_events_by_date
+    predicates = [predicate for predicate in predicates if predicate is not None]
+    if predicates:
+        events = [
+            event
+            for event in events
+            if all(predicate(event) for predicate in predicates)
+        ]
+
+    # Free-text search scores the survivors in one batch
+    if spec.search:
+        events = search_events(events, spec.search, spec.threshold)
+
+    return events
+
+
 def sort_events(
     events: List[Dict[str, Any]], sort_by: str = "date", order: str = "asc"
 ) -> List[Dict[str, Any]]:
-    """Sort events by various criteria"""
+    """Return events sorted by various criteria (the input list is not modified)"""
     if not events:
         return events
 
     reverse = order.lower() == "desc"
 
+    # Extract each event's sort key once, then sort the keys' indexes
     if sort_by == "date":
-        events.sort(key=lambda x: x.get("start_time", ""), reverse=reverse)
-    elif sort_by == "name":
-        events.sort(key=lambda x: x.get("name", "").lower(), reverse=reverse)
-    elif sort_by == "price":
-        events.sort(
-            key=lambda x: min(x.get("seat_type_prices", {}).values())
-            if x.get("seat_type_prices")
-            else 0,
-            reverse=reverse,
-        )
-
-    return events
+        keys = [event.get("start_time", "") for event in events]
+    elif sort_by in ("name", "price"):
+        for event in events:
+            if "_name_lower" not in event or "_min_price" not in event:
+                prepare_event(event)
+        if sort_by == "name":
+            keys = [event["_name_lower"] for event in events]
+        else:
+            keys = [
+                event["_min_price"] if event["_min_price"] is not None else 0
+                for event in events
+            ]
+    else:
+        return list(events)
+
+    order_indexes = sorted(range(len(events)), key=keys.__getitem__, reverse=reverse)
+    return [events[i] for i in order_indexes]
@@ -1,8 +1,10 @@
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.database import db_client
 from app.routers import (analytics, event, event_seat, seat_booking,
@@ -11,11 +13,21 @@ from app.routers import (analytics, event, event_seat, seat_booking,
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Stop the DynamoDB worker threads when the app shuts down"""
+    yield
+    await db_client.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Evently - Event Booking Platform",
     description="A scalable event booking platform for managing venues, events, and seat reservations",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -57,7 +69,7 @@ async def root():
 @app.get("/db-test")
 async def test_database():
     """Test DynamoDB connection"""
-    return db_client.test_connection()
+    return await db_client.test_connection()
 
 
 if __name__ == "__main__":
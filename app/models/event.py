@@ -28,17 +28,8 @@ class Event(BaseModel):
     created_at: str
 
 
-class EventResponse(BaseModel):
-    event_id: str
-    venue_id: str
-    name: str
-    start_time: str
-    duration: int
-    artists: List[str]
-    tags: List[str]
-    description: str
-    seat_type_prices: Dict[str, float]
-    created_at: str
+class EventResponse(Event):
+    pass
 
 
 class EventSeat(BaseModel):
@@ -48,25 +39,16 @@ class EventSeat(BaseModel):
     seat_num: int
     seat_type: str
     seat_state: str  # available, held, booked
-    booking_id: str = None
-    holding_id: str = None
-    hold_ttl: int = None
-    price: float
-
-
-class EventSeatResponse(BaseModel):
-    event_id: str
-    seat_pos: str
-    row: str
-    seat_num: int
-    seat_type: str
-    seat_state: str
     booking_id: Optional[str] = None
     holding_id: Optional[str] = None
     hold_ttl: Optional[int] = None
     price: float
 
 
+class EventSeatResponse(EventSeat):
+    pass
+
+
 class SeatHoldRequest(BaseModel):
     user_id: str
     seats: List[str]  # List of seat positions to hold
@@ -99,14 +81,8 @@ class Booking(BaseModel):
     payment_status: str
 
 
-class BookingResponse(BaseModel):
-    booking_id: str
-    event_id: str
-    user_id: str
-    seats: List[str]
-    booking_date: str
-    state: str
-    payment_status: str
+class BookingResponse(Booking):
+    pass
 
 
 class PaymentConfirmRequest(BaseModel):
@@ -135,7 +111,7 @@ class EventAnalytics(BaseModel):
     failed_holds: int
     revenue_generated: float
     average_booking_value: float
-    last_booking_time: str = None
+    last_booking_time: Optional[str] = None
     created_at: str
     start_time: str
     duration: int
@@ -201,7 +177,7 @@ class ComprehensiveEventAnalytics(BaseModel):
     revenue_by_seat_type: dict
 
     # Timing
-    last_booking_time: str = None
+    last_booking_time: Optional[str] = None
 
     # Detailed Data
     booking_analytics: List[BookingAnalytics]
@@ -17,12 +17,8 @@ class Seat(BaseModel):
     seat_pos: str  # Combined row and seat_num for unique identification
 
 
-class SeatResponse(BaseModel):
-    venue_id: str
-    row: str
-    seat_num: int
-    seat_type: str
-    seat_pos: str
+class SeatResponse(Seat):
+    pass
 
 
 class VenueSeatCreate(BaseModel):
@@ -31,9 +31,5 @@ class UserBooking(BaseModel):
     state: str
 
 
-class UserBookingResponse(BaseModel):
-    booking_id: str
-    event_id: str
-    seats: list
-    booking_date: str
-    state: str
+class UserBookingResponse(UserBooking):
+    pass
@@ -1,17 +1,283 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
-from decimal import Decimal
-from typing import List, Optional
+from operator import itemgetter
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Path, Query
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Path, Query, Response
+from fastapi.responses import StreamingResponse
 
-from app.database import db_client
+from app.cache import async_ttl_cache
+from app.database import BOOKINGS_BY_STATE_INDEX, db_client
 from app.models.event import (BookingAnalytics, ComprehensiveEventAnalytics,
                               EventAnalytics, SeatAnalytics)
+from app.utils import decode_cursor, encode_cursor, stream_json_array
 
 router = APIRouter(tags=["analytics"])
 
+# Bookings have timestamp as sk starting with year
+BOOKING_SK_PREFIX = "202"
+
+# Seconds an analytics response is reused for repeated (dashboard) requests
+ANALYTICS_CACHE_TTL = 30
+
+# Seconds a per-event {seat_pos: price} map is reused; holds and bookings
+# never change seat prices, so this is not invalidated on partition writes
+SEAT_PRICE_CACHE_TTL = 60
+seat_price_cache = TTLCache(maxsize=1024, ttl=SEAT_PRICE_CACHE_TTL)
+
+# Holdings share the event's partition with a "holding-<id>" sort key
+HOLDING_SK_PREFIX = "holding-"
+
+
+@dataclass
+class EventBundle:
+    """An event's partition split into the event, its seats and its bookings"""
+
+    event: Dict[str, Any]
+    seats: List[Dict[str, Any]]
+    bookings: List[Dict[str, Any]]
+
+
+async def _load_event_bundle(
+    event_id: str, include_bookings: bool = True, seat_state: Optional[str] = None
+) -> EventBundle:
+    """Fetch an event with its seats and bookings in a single partition query"""
+    if seat_state:
+        # Only the event item and seats in this state leave the server
+        result = await db_client.query_items(
+            event_id,
+            filter_expression="sk = :event OR seat_state = :seat_state",
+            expression_values={":event": "EVENT", ":seat_state": seat_state},
+        )
+    elif include_bookings:
+        result = await db_client.query_items(event_id)
+    else:
+        # Leave booking and holding rows on the server
+        result = await db_client.query_items(
+            event_id,
+            filter_expression=(
+                "NOT begins_with(sk, :booking) AND NOT begins_with(sk, :holding)"
+            ),
+            expression_values={
+                ":booking": BOOKING_SK_PREFIX,
+                ":holding": HOLDING_SK_PREFIX,
+            },
+        )
+    if result["status"] == "error":
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching event: {result['error']}"
+        )
+
+    event = None
+    seats = []
+    bookings = []
+    for item in result["items"]:
+        sk = item.get("sk", "")
+        if sk == "EVENT":
+            event = item
+        elif sk.startswith(BOOKING_SK_PREFIX):
+            bookings.append(item)
+        elif sk.startswith(HOLDING_SK_PREFIX):
+            continue  # Holdings are transient and not part of any analytics
+        else:
+            seats.append(item)
+
+    # Verify event exists
+    if event is None:
+        raise HTTPException(
+            status_code=404, detail=f"Event with ID {event_id} not found"
+        )
+
+    return EventBundle(event=event, seats=seats, bookings=bookings)
+
+
+async def _load_seat_prices(event_id: str) -> Dict[str, float]:
+    """Get an event's {seat_pos: price} map, verifying that the event exists"""
+    seat_prices = seat_price_cache.get(event_id)
+    if seat_prices is None:
+        bundle = await _load_event_bundle(event_id, include_bookings=False)
+        seat_prices = {
+            item.get("seat_pos"): _as_float(item.get("price")) for item in bundle.seats
+        }
+        seat_price_cache[event_id] = seat_prices
+        return seat_prices
+
+    # Seat prices are cached, so skip the seats round-trip entirely
+    event_result = await db_client.get_item(event_id, "EVENT")
+    if event_result["status"] == "not_found":
+        raise HTTPException(
+            status_code=404, detail=f"Event with ID {event_id} not found"
+        )
+    elif event_result["status"] == "error":
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching event: {event_result['error']}"
+        )
+    return seat_prices
+
+
+async def _venue_name(event_data: Dict[str, Any]) -> str:
+    """Name of an event's venue, read from the venue only for older events"""
+    venue_name = event_data.get("venue_name")
+    if venue_name:
+        return venue_name
+
+    # Served from the client's venue cache for hot events
+    venue_result = await db_client.get_venue(event_data["venue_id"])
+    if venue_result["status"] == "not_found":
+        return "Unknown Venue"
+
+    return venue_result["item"].get("name", "Unknown Venue")
+
+
+def _as_float(value: Any) -> float:
+    """Convert a DynamoDB number (Decimal, int or str) to float, None as 0.0"""
+    return float(value) if value is not None else 0.0
+
+
+def _as_int(value: Any) -> int:
+    """Convert a DynamoDB number (Decimal, int or str) to int, None as 0"""
+    return int(value) if value is not None else 0
+
+
+def _summarize_bookings(
+    bookings: List[Dict[str, Any]]
+) -> Tuple[int, int, Optional[str]]:
+    """Count confirmed/cancelled bookings and find the latest booking_date"""
+    successful = 0
+    cancelled = 0
+    latest_booking = None
+    latest_date = None
+    for booking in bookings:
+        get = booking.get
+        state = get("state")
+        if state == "confirmed":
+            successful += 1
+        elif state == "cancelled":
+            cancelled += 1
+
+        booking_date = get("booking_date", "")
+        if latest_booking is None or booking_date > latest_date:
+            latest_booking = booking
+            latest_date = booking_date
+
+    last_booking_time = (
+        latest_booking.get("booking_date") if latest_booking is not None else None
+    )
+    return successful, cancelled, last_booking_time
+
+
+async def _load_event_seat_fields(event_id: str, fields: List[str]) -> EventBundle:
+    """Fetch an event with only the given attributes of each of its seats"""
+    event_result, seats_result = await asyncio.gather(
+        db_client.get_item(event_id, "EVENT"),
+        db_client.query_items(
+            event_id,
+            filter_expression=(
+                "sk <> :event AND NOT begins_with(sk, :booking) "
+                "AND NOT begins_with(sk, :holding)"
+            ),
+            expression_values={
+                ":event": "EVENT",
+                ":booking": BOOKING_SK_PREFIX,
+                ":holding": HOLDING_SK_PREFIX,
+            },
+            projection=fields,
+        ),
+    )
+
+    # Verify event exists
+    if event_result["status"] == "not_found":
+        raise HTTPException(
+            status_code=404, detail=f"Event with ID {event_id} not found"
+        )
+    elif event_result["status"] == "error":
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching event: {event_result['error']}"
+        )
+
+    if seats_result["status"] == "error":
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching seats: {seats_result['error']}"
+        )
+
+    return EventBundle(
+        event=event_result["item"], seats=seats_result["items"], bookings=[]
+    )
+
+
+async def _load_event_with_booking_counts(
+    event_id: str, include_bookings: bool, seat_fields: Optional[List[str]] = None
+) -> Tuple[EventBundle, int, int, int, Optional[str]]:
+    """Load an event bundle with its total/confirmed/cancelled booking counts and
+    last booking time, avoiding booking rows when they aren't needed"""
+    if include_bookings:
+        bundle = await _load_event_bundle(event_id)
+        return (bundle, *_count_bookings(bundle.bookings))
+
+    if seat_fields:
+        bundle = await _load_event_seat_fields(event_id, seat_fields)
+    else:
+        bundle = await _load_event_bundle(event_id, include_bookings=False)
+    event_data = bundle.event
+
+    # Bookings written before event_state existed are missing from the index,
+    # so only events created with it, or marked by app.backfill, count there
+    if not (
+        event_data.get("booking_states_indexed")
+        and await db_client.has_index(BOOKINGS_BY_STATE_INDEX)
+    ):
+        bookings_result = await db_client.query_items(event_id, BOOKING_SK_PREFIX)
+        if bookings_result["status"] == "error":
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error fetching bookings: {bookings_result['error']}",
+            )
+        return (bundle, *_count_bookings(bookings_result["items"]))
+
+    confirmed_result, cancelled_result, last_result = await asyncio.gather(
+        db_client.count_bookings_by_state(event_id, "confirmed"),
+        db_client.count_bookings_by_state(event_id, "cancelled"),
+        # Booking sort keys are timestamps, so the last one is the newest booking
+        db_client.query_last_item(event_id, BOOKING_SK_PREFIX, "booking_date"),
+    )
+    for result in (confirmed_result, cancelled_result, last_result):
+        if result["status"] == "error":
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error fetching bookings: {result['error']}",
+            )
+
+    successful = confirmed_result["count"]
+    cancelled = cancelled_result["count"]
+    last_booking = last_result["item"]
+    last_booking_time = (
+        last_booking.get("booking_date") if last_booking is not None else None
+    )
+    return bundle, successful + cancelled, successful, cancelled, last_booking_time
+
+
+def _count_bookings(
+    bookings: List[Dict[str, Any]]
+) -> Tuple[int, int, int, Optional[str]]:
+    """Total, confirmed and cancelled counts plus last booking time of bookings"""
+    successful, cancelled, last_booking_time = _summarize_bookings(bookings)
+    return len(bookings), successful, cancelled, last_booking_time
+
+
+def _sort_by_booking_date(bookings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort bookings in place, most recent booking_date first"""
+    # Fill missing dates once so the C-level itemgetter can serve as the key
+    for booking in bookings:
+        booking.setdefault("booking_date", "")
+    bookings.sort(key=itemgetter("booking_date"), reverse=True)
+    return bookings
+
 
 @router.get("/events/{event_id}/analytics", response_model=EventAnalytics)
+@async_ttl_cache(maxsize=1024, ttl=ANALYTICS_CACHE_TTL)
 async def get_event_analytics(
     event_id: str = Path(..., description="The event ID"),
     include_seat_details: bool = Query(
@@ -23,80 +289,45 @@ async def get_event_analytics(
 ):
     """Get comprehensive analytics for an event"""
     try:
-        # First verify event exists
-        event_result = db_client.get_item(event_id, "EVENT")
-        if event_result["status"] == "not_found":
-            raise HTTPException(
-                status_code=404, detail=f"Event with ID {event_id} not found"
-            )
-        elif event_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error fetching event: {event_result['error']}"
-            )
+        # Fetch the event and its seats; bookings are counted unless listed
+        (
+            bundle,
+            total_bookings,
+            successful_bookings,
+            cancelled_bookings,
+            last_booking_time,
+        ) = await _load_event_with_booking_counts(
+            event_id,
+            include_bookings=False,
+            # Top-line metrics only need each seat's state and price
+            seat_fields=None if include_seat_details else ["seat_state", "price"],
+        )
 
-        event_data = event_result["item"]
+        event_data = bundle.event
 
         # Get venue information
-        venue_result = db_client.get_item(event_data["venue_id"], "VENUE")
-        if venue_result["status"] == "not_found":
-            venue_name = "Unknown Venue"
-        else:
-            venue_name = venue_result["item"].get("name", "Unknown Venue")
+        venue_name = await _venue_name(event_data)
 
-        # Get all seats for the event
-        seats_result = db_client.query_items(event_id)
-        if seats_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error fetching seats: {seats_result['error']}"
-            )
-
-        # Process seat data
-        seats = []
-        seat_states = {"available": 0, "held": 0, "booked": 0}
+        # Process seat data in a single pass
+        total_seats = 0
+        seat_states = defaultdict(int)
         total_revenue = 0.0
-        seat_prices = {}
-
-        for item in seats_result["items"]:
-            if item.get("sk") == "EVENT":
-                continue  # Skip the event object itself
 
-            seat_state = item.get("seat_state", "available")
-            seat_states[seat_state] = seat_states.get(seat_state, 0) + 1
+        for item in bundle.seats:
+            get = item.get
+            total_seats += 1
+            seat_state = get("seat_state", "available")
+            seat_states[seat_state] += 1
 
             # Calculate revenue for booked seats
             if seat_state == "booked":
-                price = float(item.get("price", 0))
-                total_revenue += price
-                seat_prices[item.get("seat_pos")] = price
-
-            seats.append(item)
-
-        # Get all bookings for the event
-        bookings_result = db_client.scan_items(
-            filter_expression="event_id = :event_id AND begins_with(sk, :booking_prefix)",
-            expression_values={
-                ":event_id": event_id,
-                ":booking_prefix": "202",  # Bookings have timestamp as sk starting with year
-            },
-        )
-
-        bookings = []
-        if bookings_result["status"] == "success":
-            bookings = bookings_result["items"]
-
-        # Calculate booking metrics
-        total_bookings = len(bookings)
-        successful_bookings = len(
-            [b for b in bookings if b.get("state") == "confirmed"]
-        )
-        cancelled_bookings = len([b for b in bookings if b.get("state") == "cancelled"])
+                total_revenue += _as_float(get("price"))
 
         # Get hold attempts from event analytics (if available)
         hold_attempts = event_data.get("hold_attempts", 0)
         failed_holds = max(0, hold_attempts - successful_bookings)
 
         # Calculate capacity utilization
-        total_seats = len(seats)
         seats_sold = seat_states["booked"]
         capacity_utilization = (
             (seats_sold / total_seats * 100) if total_seats > 0 else 0.0
@@ -107,15 +338,6 @@ async def get_event_analytics(
             total_revenue / successful_bookings if successful_bookings > 0 else 0.0
         )
 
-        # Get last booking time
-        last_booking_time = None
-        if bookings:
-            # Sort by booking_date and get the most recent
-            sorted_bookings = sorted(
-                bookings, key=lambda x: x.get("booking_date", ""), reverse=True
-            )
-            last_booking_time = sorted_bookings[0].get("booking_date")
-
         # Build analytics response
         analytics = EventAnalytics(
             event_id=event_id,
@@ -151,6 +373,48 @@ async def get_event_analytics(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+async def _seat_analytics_rows(
+    event_id: str, seat_type: Optional[str], seat_state: Optional[str]
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield SeatAnalytics rows page by page from the partition"""
+    # Let DynamoDB drop rows that don't match the filters
+    conditions = []
+    expression_values = {}
+    if seat_type:
+        conditions.append("seat_type = :seat_type")
+        expression_values[":seat_type"] = seat_type
+    if seat_state:
+        conditions.append("seat_state = :seat_state")
+        expression_values[":seat_state"] = seat_state
+
+    async for item in db_client.query_iter(
+        event_id,
+        filter_expression=" AND ".join(conditions),
+        expression_values=expression_values,
+    ):
+        get = item.get
+        sk = get("sk", "")
+        if (
+            sk == "EVENT"
+            or sk.startswith(BOOKING_SK_PREFIX)
+            or sk.startswith(HOLDING_SK_PREFIX)
+        ):
+            continue
+
+        # Plain dicts with the SeatAnalytics fields, already coerced here
+        yield {
+            "seat_pos": get("seat_pos", ""),
+            "row": get("row", ""),
+            "seat_num": _as_int(get("seat_num")),
+            "seat_type": get("seat_type", ""),
+            "seat_state": get("seat_state", "available"),
+            "price": _as_float(get("price")),
+            "booking_id": get("booking_id"),
+            "holding_id": get("holding_id"),
+            "last_updated": get("updated_at"),
+        }
+
+
 @router.get("/events/{event_id}/seats/analytics", response_model=List[SeatAnalytics])
 async def get_seat_analytics(
     event_id: str = Path(..., description="The event ID"),
@@ -159,8 +423,8 @@ async def get_seat_analytics(
 ):
     """Get detailed analytics for all seats in an event"""
     try:
-        # First verify event exists
-        event_result = db_client.get_item(event_id, "EVENT")
+        # Verify event exists before the response starts streaming
+        event_result = await db_client.get_item(event_id, "EVENT")
         if event_result["status"] == "not_found":
             raise HTTPException(
                 status_code=404, detail=f"Event with ID {event_id} not found"
@@ -170,49 +434,12 @@ async def get_seat_analytics(
                 status_code=500, detail=f"Error fetching event: {event_result['error']}"
             )
 
-        # Get all seats for the event
-        seats_result = db_client.query_items(event_id)
-        if seats_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error fetching seats: {seats_result['error']}"
-            )
-
-        # Process seat data
-        seat_analytics = []
-        for item in seats_result["items"]:
-            if item.get("sk") == "EVENT":
-                continue  # Skip the event object itself
-
-            # Apply filters
-            if seat_type and item.get("seat_type") != seat_type:
-                continue
-            if seat_state and item.get("seat_state") != seat_state:
-                continue
-
-            # Convert Decimal price to float
-            price = (
-                float(item.get("price", 0))
-                if isinstance(item.get("price"), Decimal)
-                else item.get("price", 0)
-            )
-
-            seat_analytics.append(
-                SeatAnalytics(
-                    seat_pos=item.get("seat_pos", ""),
-                    row=item.get("row", ""),
-                    seat_num=int(item.get("seat_num", 0))
-                    if isinstance(item.get("seat_num"), Decimal)
-                    else item.get("seat_num", 0),
-                    seat_type=item.get("seat_type", ""),
-                    seat_state=item.get("seat_state", "available"),
-                    price=price,
-                    booking_id=item.get("booking_id"),
-                    holding_id=item.get("holding_id"),
-                    last_updated=item.get("updated_at"),
-                )
-            )
-
-        return seat_analytics
+        # Rows are serialized as they come off the query pages, so memory
+        # stays bounded by one page; response_model still documents the shape
+        return StreamingResponse(
+            stream_json_array(_seat_analytics_rows(event_id, seat_type, seat_state)),
+            media_type="application/json",
+        )
 
     except HTTPException:
         raise
@@ -224,63 +451,55 @@ async def get_seat_analytics(
     "/events/{event_id}/bookings/analytics", response_model=List[BookingAnalytics]
 )
 async def get_booking_analytics(
+    response: Response,
     event_id: str = Path(..., description="The event ID"),
     state: Optional[str] = Query(None, description="Filter by booking state"),
     limit: int = Query(100, description="Maximum number of bookings to return"),
     offset: int = Query(0, description="Number of bookings to skip"),
+    cursor: Optional[str] = Query(
+        None, description="Resume after the page that returned this X-Next-Cursor"
+    ),
 ):
     """Get detailed analytics for all bookings in an event"""
     try:
-        # First verify event exists
-        event_result = db_client.get_item(event_id, "EVENT")
-        if event_result["status"] == "not_found":
-            raise HTTPException(
-                status_code=404, detail=f"Event with ID {event_id} not found"
-            )
-        elif event_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error fetching event: {event_result['error']}"
-            )
+        start_key = None
+        if cursor:
+            start_key = decode_cursor(cursor)
+            if start_key is None or start_key.get("pk") != event_id:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        offset = max(0, offset)
+
+        # Apply state filter server-side ("state" is a reserved word)
+        state_filter = {}
+        if state:
+            state_filter = {
+                "filter_expression": "#state = :state",
+                "expression_values": {":state": state},
+                "expression_names": {"#state": "state"},
+            }
 
-        # Get all bookings for the event
-        bookings_result = db_client.scan_items(
-            filter_expression="event_id = :event_id AND begins_with(sk, :booking_prefix)",
-            expression_values={
-                ":event_id": event_id,
-                ":booking_prefix": "202",  # Bookings have timestamp as sk starting with year
-            },
+        # Booking sort keys are timestamps, so a reverse query returns the
+        # most recent first and reads only as far as the requested page
+        seat_prices, page = await asyncio.gather(
+            _load_seat_prices(event_id),
+            db_client.query_page(
+                event_id,
+                BOOKING_SK_PREFIX,
+                limit=offset + max(0, limit),
+                start_key=start_key,
+                descending=True,
+                **state_filter,
+            ),
         )
-
-        if bookings_result["status"] == "error":
+        if page["status"] == "error":
             raise HTTPException(
-                status_code=500,
-                detail=f"Error fetching bookings: {bookings_result['error']}",
+                status_code=500, detail=f"Error fetching bookings: {page['error']}"
             )
 
-        bookings = bookings_result["items"]
-
-        # Apply state filter
-        if state:
-            bookings = [b for b in bookings if b.get("state") == state]
-
-        # Sort by booking date (most recent first)
-        bookings.sort(key=lambda x: x.get("booking_date", ""), reverse=True)
-
         # Apply pagination
-        bookings = bookings[offset : offset + limit]
-
-        # Get seat prices for revenue calculation
-        seats_result = db_client.query_items(event_id)
-        seat_prices = {}
-        if seats_result["status"] == "success":
-            for item in seats_result["items"]:
-                if item.get("sk") != "EVENT":
-                    price = (
-                        float(item.get("price", 0))
-                        if isinstance(item.get("price"), Decimal)
-                        else item.get("price", 0)
-                    )
-                    seat_prices[item.get("seat_pos")] = price
+        bookings = page["items"][offset:]
+        if page["last_key"]:
+            response.headers["X-Next-Cursor"] = encode_cursor(page["last_key"])
 
         # Process booking data
         booking_analytics = []
@@ -310,51 +529,27 @@ async def get_booking_analytics(
 
 
 @router.get("/events/{event_id}/revenue")
+@async_ttl_cache(maxsize=1024, ttl=ANALYTICS_CACHE_TTL)
 async def get_revenue_analytics(
     event_id: str = Path(..., description="The event ID"),
     by_seat_type: bool = Query(False, description="Break down revenue by seat type"),
 ):
     """Get revenue analytics for an event"""
     try:
-        # First verify event exists
-        event_result = db_client.get_item(event_id, "EVENT")
-        if event_result["status"] == "not_found":
-            raise HTTPException(
-                status_code=404, detail=f"Event with ID {event_id} not found"
-            )
-        elif event_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error fetching event: {event_result['error']}"
-            )
-
-        # Get all seats for the event
-        seats_result = db_client.query_items(event_id)
-        if seats_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error fetching seats: {seats_result['error']}"
-            )
+        # Fetch the event and only its booked seats in one partition query
+        bundle = await _load_event_bundle(event_id, seat_state="booked")
 
         # Calculate revenue by seat type
         revenue_by_type = {}
         total_revenue = 0.0
 
-        for item in seats_result["items"]:
-            if item.get("sk") == "EVENT":
-                continue  # Skip the event object itself
+        for item in bundle.seats:
+            get = item.get
+            seat_type = get("seat_type", "unknown")
+            price = _as_float(get("price"))
 
-            if item.get("seat_state") == "booked":
-                seat_type = item.get("seat_type", "unknown")
-                price = (
-                    float(item.get("price", 0))
-                    if isinstance(item.get("price"), Decimal)
-                    else item.get("price", 0)
-                )
-
-                if seat_type not in revenue_by_type:
-                    revenue_by_type[seat_type] = 0.0
-
-                revenue_by_type[seat_type] += price
-                total_revenue += price
+            revenue_by_type[seat_type] = revenue_by_type.get(seat_type, 0.0) + price
+            total_revenue += price
 
         # Build response
         response = {
@@ -380,6 +575,7 @@ async def get_revenue_analytics(
 @router.get(
     "/events/{event_id}/comprehensive", response_model=ComprehensiveEventAnalytics
 )
+@async_ttl_cache(maxsize=1024, ttl=ANALYTICS_CACHE_TTL)
 async def get_comprehensive_event_analytics(
     event_id: str = Path(..., description="The event ID"),
     include_booking_details: bool = Query(
@@ -392,89 +588,53 @@ async def get_comprehensive_event_analytics(
 ):
     """Get comprehensive analytics for an event in a single response"""
     try:
-        # First verify event exists
-        event_result = db_client.get_item(event_id, "EVENT")
-        if event_result["status"] == "not_found":
-            raise HTTPException(
-                status_code=404, detail=f"Event with ID {event_id} not found"
-            )
-        elif event_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error fetching event: {event_result['error']}"
-            )
-
-        event_data = event_result["item"]
+        # Fetch the event and its seats; bookings are counted unless listed
+        (
+            bundle,
+            total_bookings,
+            successful_bookings,
+            cancelled_bookings,
+            last_booking_time,
+        ) = await _load_event_with_booking_counts(
+            event_id, include_bookings=include_booking_details
+        )
+        event_data = bundle.event
 
         # Get venue information
-        venue_result = db_client.get_item(event_data["venue_id"], "VENUE")
-        if venue_result["status"] == "not_found":
-            venue_name = "Unknown Venue"
-        else:
-            venue_name = venue_result["item"].get("name", "Unknown Venue")
-
-        # Get all seats for the event
-        seats_result = db_client.query_items(event_id)
-        if seats_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error fetching seats: {seats_result['error']}"
-            )
+        venue_name = await _venue_name(event_data)
 
-        # Process seat data
-        seats = []
-        seat_states = {"available": 0, "held": 0, "booked": 0}
+        # Process seat data in a single pass
+        total_seats = 0
+        seat_states = defaultdict(int)
         total_revenue = 0.0
         revenue_by_seat_type = {}
+        seat_prices = {}
 
-        for item in seats_result["items"]:
-            if item.get("sk") == "EVENT":
-                continue  # Skip the event object itself
-
-            seat_state = item.get("seat_state", "available")
-            seat_states[seat_state] = seat_states.get(seat_state, 0) + 1
+        for item in bundle.seats:
+            get = item.get
+            total_seats += 1
+            seat_state = get("seat_state", "available")
+            seat_states[seat_state] += 1
 
-            # Convert Decimal price to float
-            price = (
-                float(item.get("price", 0))
-                if isinstance(item.get("price"), Decimal)
-                else item.get("price", 0)
-            )
-            seat_type = item.get("seat_type", "unknown")
+            # Price every seat for the booking totals below
+            if include_booking_details:
+                seat_prices[get("seat_pos")] = _as_float(get("price"))
 
             # Calculate revenue for booked seats
             if seat_state == "booked":
-                total_revenue += price
-                if seat_type not in revenue_by_seat_type:
-                    revenue_by_seat_type[seat_type] = 0.0
-                revenue_by_seat_type[seat_type] += price
-
-            seats.append(item)
-
-        # Get all bookings for the event
-        bookings_result = db_client.scan_items(
-            filter_expression="event_id = :event_id AND begins_with(sk, :booking_prefix)",
-            expression_values={
-                ":event_id": event_id,
-                ":booking_prefix": "202",  # Bookings have timestamp as sk starting with year
-            },
-        )
-
-        bookings = []
-        if bookings_result["status"] == "success":
-            bookings = bookings_result["items"]
+                price = _as_float(get("price"))
+                seat_type = get("seat_type", "unknown")
 
-        # Calculate booking metrics
-        total_bookings = len(bookings)
-        successful_bookings = len(
-            [b for b in bookings if b.get("state") == "confirmed"]
-        )
-        cancelled_bookings = len([b for b in bookings if b.get("state") == "cancelled"])
+                total_revenue += price
+                revenue_by_seat_type[seat_type] = (
+                    revenue_by_seat_type.get(seat_type, 0.0) + price
+                )
 
         # Get hold attempts from event analytics (if available)
         hold_attempts = event_data.get("hold_attempts", 0)
         failed_holds = max(0, hold_attempts - successful_bookings)
 
         # Calculate capacity utilization
-        total_seats = len(seats)
         seats_sold = seat_states["booked"]
         capacity_utilization = (
             (seats_sold / total_seats * 100) if total_seats > 0 else 0.0
@@ -485,22 +645,11 @@ async def get_comprehensive_event_analytics(
             total_revenue / successful_bookings if successful_bookings > 0 else 0.0
         )
 
-        # Get last booking time
-        last_booking_time = None
-        if bookings:
-            # Sort by booking_date and get the most recent
-            sorted_bookings = sorted(
-                bookings, key=lambda x: x.get("booking_date", ""), reverse=True
-            )
-            last_booking_time = sorted_bookings[0].get("booking_date")
-
         # Build booking analytics if requested
         booking_analytics = []
         if include_booking_details:
             # Sort by booking date (most recent first)
-            sorted_bookings = sorted(
-                bookings, key=lambda x: x.get("booking_date", ""), reverse=True
-            )
+            sorted_bookings = _sort_by_booking_date(list(bundle.bookings))
 
             # Apply pagination
             paginated_bookings = sorted_bookings[
@@ -510,13 +659,7 @@ async def get_comprehensive_event_analytics(
             for booking in paginated_bookings:
                 booking_seats = booking.get("seats", [])
                 booking_total = sum(
-                    revenue_by_seat_type.get(
-                        seat.split("-")[0] + "-" + seat.split("-")[1]
-                        if "-" in seat
-                        else seat,
-                        0,
-                    )
-                    for seat in booking_seats
+                    seat_prices.get(seat, 0.0) for seat in booking_seats
                 )
 
                 booking_analytics.append(
@@ -593,3 +736,16 @@ async def get_comprehensive_event_analytics(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+def _invalidate_event_analytics(pk: str) -> None:
+    """Drop cached analytics for an event after any write to its partition"""
+    for endpoint in (
+        get_event_analytics,
+        get_revenue_analytics,
+        get_comprehensive_event_analytics,
+    ):
+        endpoint.invalidate(event_id=pk)
+
+
+db_client.add_write_listener(_invalidate_event_analytics)
@@ -1,31 +1,58 @@
-import uuid
+import asyncio
+import secrets
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
+from cachetools import LRUCache
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 
-from app.database import db_client
-from app.filtering import (filter_events_by_artists, filter_events_by_city,
-                           filter_events_by_date, filter_events_by_price_range,
-                           filter_events_by_tags, search_events, sort_events)
+from app.database import (ENTITIES_BY_CITY_INDEX, EVENT_ENTITY_TYPE,
+                          EVENTS_BY_CITY_INDEX, EVENTS_BY_TYPE_INDEX,
+                          PARALLEL_SCAN_SEGMENTS, city_key, db_client)
+from app.filtering import (FilterSpec, apply_filters, city_matches,
+                           prepare_event, sort_events)
 from app.models.event import EventCreate, EventResponse
 from app.routers.event_seat import create_event_seats
+from app.utils import decode_cursor, encode_cursor
 
 router = APIRouter(tags=["events"])
 
+# Events are not modified after creation, so their listing dicts are reused
+EVENT_DICT_CACHE_SIZE = 4096
+event_dict_cache = LRUCache(maxsize=EVENT_DICT_CACHE_SIZE)
+
+# Attributes listings read from event items (skips the analytics counters)
+EVENT_LISTING_FIELDS = [
+    "event_id",
+    "venue_id",
+    "city",
+    "name",
+    "start_time",
+    "duration",
+    "artists",
+    "tags",
+    "description",
+    "seat_type_prices",
+    "created_at",
+]
+
 
 def generate_event_id() -> str:
     """Generate a unique event ID"""
-    return f"event-{str(uuid.uuid4())[:8]}"
+    return f"event-{secrets.token_hex(4)}"
 
 
 @router.post("/events", response_model=EventResponse)
 async def create_event(event_data: EventCreate):
     """Create a new event and all associated event seats"""
     try:
-        # First, verify that the venue exists
-        venue_result = db_client.get_item(event_data.venue_id, "VENUE")
+        # Verify the venue exists while its seats are fetched for the event seats
+        venue_result, seats_result = await asyncio.gather(
+            db_client.get_item(event_data.venue_id, "VENUE"),
+            db_client.query_items(event_data.venue_id),
+        )
         if venue_result["status"] == "not_found":
             raise HTTPException(
                 status_code=404, detail=f"Venue with ID {event_data.venue_id} not found"
@@ -60,8 +87,15 @@ async def create_event(event_data: EventCreate):
         event_item = {
             "pk": event_id,
             "sk": "EVENT",
+            # Puts the event in the entity type GSI used to list events
+            "entity_type": EVENT_ENTITY_TYPE,
             "event_id": event_id,
             "venue_id": event_data.venue_id,
+            # Venue city copied onto the event for the city GSI
+            "city": venue.get("city", ""),
+            "city_key": city_key(venue.get("city", "")),
+            # Venue name copied too so analytics can skip the venue read
+            "venue_name": venue.get("name", ""),
             "name": event_data.name,
             "start_time": event_data.start_time,
             "duration": event_data.duration,
@@ -70,6 +104,9 @@ async def create_event(event_data: EventCreate):
             "description": event_data.description,
             "seat_type_prices": seat_type_prices_decimal,
             "created_at": current_time.isoformat(),
+            # Every booking of a new event carries event_state, so analytics
+            # can count them from the bookings-by-state index
+            "booking_states_indexed": True,
             # Analytics fields
             "total_bookings": 0,
             "total_cancellations": 0,
@@ -78,7 +115,7 @@ async def create_event(event_data: EventCreate):
         }
 
         # Put event into DynamoDB
-        event_result = db_client.put_item(event_item)
+        event_result = await db_client.put_item(event_item)
         if event_result["status"] == "error":
             raise HTTPException(
                 status_code=500,
@@ -87,8 +124,11 @@ async def create_event(event_data: EventCreate):
 
         # Create event seats using the separate module
         try:
-            event_seats_created = create_event_seats(
-                event_id, event_data.venue_id, event_data.seat_type_prices
+            event_seats_created = await create_event_seats(
+                event_id,
+                event_data.venue_id,
+                event_data.seat_type_prices,
+                seats_result,
             )
 
             if event_seats_created == 0:
@@ -120,7 +160,90 @@ async def create_event(event_data: EventCreate):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.get("/events", response_model=List[EventResponse])
+def _event_dict(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a plain event dict (EventResponse fields) from a table item"""
+    # Convert Decimal prices back to float for response
+    seat_type_prices = {
+        seat_type: float(price) if isinstance(price, Decimal) else price
+        for seat_type, price in item["seat_type_prices"].items()
+    }
+
+    return {
+        "event_id": item["event_id"],
+        "venue_id": item["venue_id"],
+        "name": item["name"],
+        "start_time": item["start_time"],
+        "duration": int(item["duration"]),
+        "artists": item["artists"],
+        "tags": item["tags"],
+        "description": item["description"],
+        "seat_type_prices": seat_type_prices,
+        "created_at": item["created_at"],
+    }
+
+
+def _listing_event(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the prepared listing dict for an event item, cached per event"""
+    key = (item["event_id"], item["created_at"])
+    event = event_dict_cache.get(key)
+    if event is None:
+        event = prepare_event(_event_dict(item))
+        event_dict_cache[key] = event
+    return event
+
+
+# Fields returned per event (listing dicts also carry precomputed filter keys)
+EVENT_RESPONSE_FIELDS = tuple(EventResponse.model_fields)
+
+
+def _events_response(
+    events: List[Dict[str, Any]], next_cursor: Optional[str] = None
+) -> ORJSONResponse:
+    """Serialize a page of listing dicts straight to JSON, skipping the
+    response_model validation (the dicts are built from trusted items)"""
+    content = [
+        {field: event[field] for field in EVENT_RESPONSE_FIELDS} for event in events
+    ]
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return ORJSONResponse(content=content, headers=headers)
+
+
+def _filter_and_sort_events(events: List[dict], spec: FilterSpec) -> List[dict]:
+    """Apply the listing filters and sort events by date (newest first)"""
+    return sort_events(apply_filters(events, spec), "date", "desc")
+
+
+async def _query_events_in_matching_cities(city: str) -> Dict[str, Any]:
+    """Read events from the city GSI for every venue city the city filter
+    matches, exact or fuzzy"""
+    venues_result = await db_client.query_venues(projection=["city_key"])
+    if venues_result["status"] == "error":
+        return venues_result
+
+    # The fuzzy match scores each distinct city once
+    cities = {venue["city_key"] for venue in venues_result["items"]}
+    results = await asyncio.gather(
+        *(
+            db_client.query_events_by_city(
+                matching_city, projection=EVENT_LISTING_FIELDS
+            )
+            for matching_city in cities
+            if city_matches(city, matching_city)
+        )
+    )
+    items = []
+    for result in results:
+        if result["status"] == "error":
+            return result
+        items.extend(result["items"])
+    return {"status": "success", "items": items, "count": len(items)}
+
+
+@router.get(
+    "/events",
+    response_model=None,
+    responses={200: {"model": List[EventResponse]}},
+)
 async def get_events(
     # Essential filters
     city: Optional[str] = Query(None, description="Filter by city"),
@@ -136,84 +259,113 @@ async def get_events(
     # Pagination
     limit: Optional[int] = Query(50, description="Maximum number of events to return"),
     offset: Optional[int] = Query(0, description="Number of events to skip"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Resume after the page that returned this X-Next-Cursor "
+        "(unfiltered listings only)",
+    ),
 ):
     """Get all events with advanced filtering and search capabilities"""
     try:
-        # Get all events from database
-        result = db_client.scan_items("sk = :sk", {":sk": "EVENT"})
+        start_idx = max(0, offset or 0)
+        end_idx = start_idx + (limit or 50)
 
-        if result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Failed to fetch events: {result['error']}"
+        # Unfiltered listings read the entity type GSI in listing order
+        # (latest start_time first), so only the requested page is fetched
+        filtered = city or start_date or end_date or search
+        if not filtered and await db_client.has_index(EVENTS_BY_TYPE_INDEX):
+            start_key = None
+            if cursor:
+                start_key = decode_cursor(cursor)
+                if (
+                    start_key is None
+                    or start_key.get("entity_type") != EVENT_ENTITY_TYPE
+                ):
+                    raise HTTPException(status_code=400, detail="Invalid cursor")
+
+            page = await db_client.query_events_page(
+                end_idx, start_key, projection=EVENT_LISTING_FIELDS
             )
-
-        # Convert to EventResponse objects
-        events = []
-        venue_cache = {}  # Cache for venue lookups
-
-        for item in result["items"]:
-            # Convert Decimal prices back to float for response
-            seat_type_prices = {
-                seat_type: float(price) if isinstance(price, Decimal) else price
-                for seat_type, price in item["seat_type_prices"].items()
-            }
-
-            event = EventResponse(
-                event_id=item["event_id"],
-                venue_id=item["venue_id"],
-                name=item["name"],
-                start_time=item["start_time"],
-                duration=item["duration"],
-                artists=item["artists"],
-                tags=item["tags"],
-                description=item["description"],
-                seat_type_prices=seat_type_prices,
-                created_at=item["created_at"],
+            if page["status"] == "error":
+                raise HTTPException(
+                    status_code=500, detail=f"Failed to fetch events: {page['error']}"
+                )
+            next_cursor = None
+            if page["last_key"]:
+                next_cursor = encode_cursor(page["last_key"])
+            return _events_response(
+                [_listing_event(item) for item in page["items"][start_idx:]],
+                next_cursor,
             )
 
-            # Convert to dict for filtering
-            event_dict = event.model_dump()
-            events.append(event_dict)
-
-            # Cache venue for city filtering
-            if city and item["venue_id"] not in venue_cache:
-                venue_result = db_client.get_item(item["venue_id"], "VENUE")
-                if venue_result["status"] == "success":
-                    venue_cache[item["venue_id"]] = venue_result["item"]
-
-        # Apply filters
-        filtered_events = events
-
-        # Date range filtering
-        if start_date:
-            filtered_events = filter_events_by_date(
-                filtered_events, start_date, "after"
+        if cursor:
+            raise HTTPException(
+                status_code=400,
+                detail="Cursor pagination is only supported for unfiltered listings",
             )
-        if end_date:
-            filtered_events = filter_events_by_date(filtered_events, end_date, "before")
 
-        # City filtering
-        if city:
-            filtered_events = filter_events_by_city(filtered_events, city, venue_cache)
+        # With the city GSIs only events in cities matching the filter are
+        # read, the same exact-or-fuzzy match the scan below applies (so
+        # "Mumbai" still finds "Navi Mumbai")
+        city_from_index = bool(city) and (
+            await db_client.has_index(EVENTS_BY_CITY_INDEX)
+            and await db_client.has_index(ENTITIES_BY_CITY_INDEX)
+        )
+        if city_from_index:
+            result = await _query_events_in_matching_cities(city)
+
+        # Get all events from database, reading only event items when the
+        # table has the entity type GSI
+        if not city_from_index:
+            if await db_client.has_index(EVENTS_BY_TYPE_INDEX):
+                result = await db_client.query_events(projection=EVENT_LISTING_FIELDS)
+            else:
+                # The listing is sorted across all events, so the scan has to
+                # finish; reading it in parallel segments shortens the wait
+                result = await db_client.scan_items_cached(
+                    "events",
+                    "sk = :sk",
+                    {":sk": "EVENT"},
+                    segments=PARALLEL_SCAN_SEGMENTS,
+                    projection=EVENT_LISTING_FIELDS,
+                )
 
-        # Search filtering (name, description, tags)
-        if search:
-            filtered_events = search_events(filtered_events, search)
+        if result["status"] == "error":
+            raise HTTPException(
+                status_code=500, detail=f"Failed to fetch events: {result['error']}"
+            )
 
-        # Sort by date (newest first)
-        filtered_events = sort_events(filtered_events, "date", "desc")
+        # Build plain dicts for filtering; events are never built as models
+        events = [_listing_event(item) for item in result["items"]]
+
+        # Events carry their venue's city, so city filtering only reads venues
+        # (once each, cached and batched) for events created before that
+        venue_cache = {}
+        if city and not city_from_index:
+            missing_city = []
+            for item in result["items"]:
+                if "city" in item:
+                    venue_cache[item["venue_id"]] = {"city": item["city"]}
+                else:
+                    missing_city.append(item["venue_id"])
+
+            if missing_city:
+                venues_result = await db_client.batch_get_venues(missing_city)
+                if venues_result["status"] == "success":
+                    venue_cache.update(venues_result["venues"])
+
+        # Filtering and sorting are CPU-bound, so run them off the event loop
+        spec = FilterSpec(
+            start_date=start_date,
+            end_date=end_date,
+            city=city if not city_from_index else None,
+            venue_cache=venue_cache,
+            search=search,
+        )
+        filtered_events = await asyncio.to_thread(_filter_and_sort_events, events, spec)
 
         # Apply pagination
-        start_idx = offset or 0
-        end_idx = start_idx + (limit or 50)
-        paginated_events = filtered_events[start_idx:end_idx]
-
-        # Convert back to EventResponse objects
-        result_events = []
-        for event_dict in paginated_events:
-            result_events.append(EventResponse(**event_dict))
-
-        return result_events
+        return _events_response(filtered_events[start_idx:end_idx])
 
     except HTTPException:
         raise
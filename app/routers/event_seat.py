@@ -1,20 +1,60 @@
 from decimal import Decimal
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException, Path
+from fastapi.responses import StreamingResponse
 
 from app.database import db_client
 from app.models.event import EventSeatResponse
+from app.utils import stream_json_array
 
 router = APIRouter(tags=["event-seats"])
 
+# Attributes get_event_seats reads from event seat items
+EVENT_SEAT_FIELDS = [
+    "sk",
+    "event_id",
+    "seat_pos",
+    "row",
+    "seat_num",
+    "seat_type",
+    "seat_state",
+    "booking_id",
+    "holding_id",
+    "hold_ttl",
+    "price",
+]
+
+
+async def _event_seat_rows(event_id: str) -> AsyncIterator[Dict[str, Any]]:
+    """Yield EventSeatResponse rows page by page from the event's partition"""
+    async for item in db_client.query_iter(event_id, projection=EVENT_SEAT_FIELDS):
+        # Skip the event object itself (sk="EVENT")
+        if item.get("sk") == "EVENT":
+            continue
+
+        # Convert Decimal numbers back to plain ints/floats for the response
+        hold_ttl = item.get("hold_ttl")
+        yield {
+            "event_id": item.get("event_id", ""),
+            "seat_pos": item.get("seat_pos", ""),
+            "row": item.get("row", ""),
+            "seat_num": int(item.get("seat_num", 0)),
+            "seat_type": item.get("seat_type", ""),
+            "seat_state": item.get("seat_state", "available"),
+            "booking_id": item.get("booking_id"),
+            "holding_id": item.get("holding_id"),
+            "hold_ttl": int(hold_ttl) if hold_ttl is not None else None,
+            "price": float(item.get("price", 0.0)),
+        }
+
 
 @router.get("/events/{event_id}/seats", response_model=List[EventSeatResponse])
 async def get_event_seats(event_id: str = Path(..., description="The event ID")):
     """Get all seats for a specific event"""
     try:
         # First verify event exists
-        event_result = db_client.get_item(event_id, "EVENT")
+        event_result = await db_client.get_item(event_id, "EVENT")
         if event_result["status"] == "not_found":
             raise HTTPException(
                 status_code=404, detail=f"Event with ID {event_id} not found"
@@ -24,43 +64,12 @@ async def get_event_seats(event_id: str = Path(..., description="The event ID"))
                 status_code=500, detail=f"Error checking event: {event_result['error']}"
             )
 
-        # Query all event seats
-        result = db_client.query_items(event_id)
-
-        if result["status"] == "error":
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to fetch event seats: {result['error']}",
-            )
-
-        seats = []
-        for item in result["items"]:
-            # Skip the event object itself (sk="EVENT")
-            if item.get("sk") == "EVENT":
-                continue
-
-            # Convert Decimal price back to float for response
-            price_value = item.get("price", 0.0)
-            price = (
-                float(price_value) if isinstance(price_value, Decimal) else price_value
-            )
-
-            seats.append(
-                EventSeatResponse(
-                    event_id=item.get("event_id", ""),
-                    seat_pos=item.get("seat_pos", ""),
-                    row=item.get("row", ""),
-                    seat_num=item.get("seat_num", 0),
-                    seat_type=item.get("seat_type", ""),
-                    seat_state=item.get("seat_state", "available"),
-                    booking_id=item.get("booking_id"),
-                    holding_id=item.get("holding_id"),
-                    hold_ttl=item.get("hold_ttl"),
-                    price=price,
-                )
-            )
-
-        return seats
+        # Seats are serialized as they come off the query pages, so memory
+        # stays bounded by one page; response_model still documents the shape
+        return StreamingResponse(
+            stream_json_array(_event_seat_rows(event_id)),
+            media_type="application/json",
+        )
 
     except HTTPException:
         raise
@@ -68,24 +77,35 @@ async def get_event_seats(event_id: str = Path(..., description="The event ID"))
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-def create_event_seats(event_id: str, venue_id: str, seat_type_prices: dict) -> int:
+async def create_event_seats(
+    event_id: str,
+    venue_id: str,
+    seat_type_prices: dict,
+    seats_result: Optional[Dict[str, Any]] = None,
+) -> int:
     """Create event seats for all venue seats. Returns number of seats created."""
     try:
-        # Get all seats for the venue
-        seats_result = db_client.query_items(venue_id)
+        # Get all seats for the venue unless the caller already fetched them
+        if seats_result is None:
+            seats_result = await db_client.query_items(venue_id)
         if seats_result["status"] == "error":
             raise Exception(f"Failed to fetch venue seats: {seats_result['error']}")
 
-        event_seats_created = 0
+        # Convert each seat type's price once, not once per seat
+        prices = {
+            seat_type: Decimal(str(price))
+            for seat_type, price in seat_type_prices.items()
+        }
 
-        # Create event seats for all venue seats
+        # Build event seats for all venue seats
+        event_seat_items = []
         for item in seats_result["items"]:
             # Skip the venue object itself (sk="VENUE")
             if item.get("sk") == "VENUE":
                 continue
 
             seat_type = item.get("seat_type")
-            if seat_type not in seat_type_prices:
+            if seat_type not in prices:
                 continue  # Skip seats with invalid seat types
 
             # Create event seat item
@@ -101,21 +121,16 @@ def create_event_seats(event_id: str, venue_id: str, seat_type_prices: dict) ->
                 "booking_id": None,
                 "holding_id": None,
                 "hold_ttl": None,
-                "price": Decimal(str(seat_type_prices[seat_type])),
+                "price": prices[seat_type],
             }
+            event_seat_items.append(event_seat_item)
 
-            # Put event seat into DynamoDB
-            seat_result = db_client.put_item(event_seat_item)
-            if seat_result["status"] == "error":
-                # If seat creation fails, log the error and continue
-                print(
-                    f"Warning: Failed to create event seat {item.get('seat_pos')}: {seat_result['error']}"
-                )
-                continue
-
-            event_seats_created += 1
+        # Put event seats into DynamoDB in concurrent batches of 25
+        write_result = await db_client.batch_write_items(event_seat_items)
+        if write_result["status"] == "error":
+            raise Exception(f"Failed to write event seats: {write_result['error']}")
 
-        return event_seats_created
+        return write_result["count"]
 
     except Exception as e:
         raise Exception(f"Failed to create event seats: {str(e)}")
@@ -1,21 +1,85 @@
-from typing import List
+from typing import Any, Callable, Dict, List
 
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Path
 
-from app.database import db_client
+from app.database import PARALLEL_SCAN_SEGMENTS, RECORDS_BY_ID_INDEX, db_client
 from app.models.event import (BookingCancelRequest, BookingResponse,
                               PaymentConfirmRequest)
 from app.utils import (create_booking_transaction_items,
                        create_cancellation_transaction_items,
                        create_enhanced_booking_transaction_items,
                        create_enhanced_cancellation_transaction_items,
-                       generate_booking_id, get_current_timestamp)
+                       generate_booking_id, get_current_timestamp,
+                       update_event_analytics)
 
 router = APIRouter(tags=["seat-booking"])
 
 
+async def _find_record(
+    record_id: str,
+    filter_expression: str,
+    expression_values: Dict[str, Any],
+    matches: Callable[[Dict[str, Any]], bool],
+) -> Dict[str, Any]:
+    """Find a holding or booking by ID, via the record ID GSI when it exists
+    (matches applies the scan's filter to the GSI's items)"""
+    if await db_client.has_index(RECORDS_BY_ID_INDEX):
+        result = await db_client.query_record(record_id)
+        if result["status"] == "error":
+            return result
+        # The GSI indexes holdings and bookings alike, so an ID of the other
+        # kind is a miss; the GSI is eventually consistent, so only when it
+        # finds nothing does the lookup fall through to the scan
+        if result["count"] > 0:
+            items = [item for item in result["items"] if matches(item)]
+            return {"status": "success", "items": items, "count": len(items)}
+
+    # Holdings and bookings are stored under event_id, so without the GSI we scan
+    return await db_client.scan_items(
+        filter_expression=filter_expression,
+        expression_values=expression_values,
+        segments=PARALLEL_SCAN_SEGMENTS,
+    )
+
+
+async def _invalid_seats(
+    event_id: str, seats: List[str], reasons: List[str], state: str, record: str
+) -> List[str]:
+    """Describe the seats whose transaction condition check failed"""
+    failed = [
+        seat_pos
+        for seat_pos, reason in zip(seats, reasons)
+        if reason == "ConditionalCheckFailed"
+    ]
+    if not failed:
+        return []
+
+    # Only read the failed seats, and only on this error path
+    seats_result = await db_client.batch_get_items(
+        [(event_id, seat_pos) for seat_pos in failed],
+        projection=["seat_pos", "seat_state"],
+    )
+
+    seat_map = {item.get("seat_pos"): item for item in seats_result.get("items", [])}
+
+    invalid_seats = []
+    for seat_pos in failed:
+        if seat_pos not in seat_map:
+            invalid_seats.append(f"{seat_pos} (seat not found)")
+            continue
+
+        seat_state = seat_map[seat_pos].get("seat_state")
+        if seat_state != state:
+            invalid_seats.append(f"{seat_pos} (state: {seat_state})")
+        else:
+            invalid_seats.append(f"{seat_pos} ({state} by different {record})")
+
+    return invalid_seats
+
+
 @router.post("/{holding_id}/confirm", response_model=BookingResponse)
 async def confirm_booking(
+    background_tasks: BackgroundTasks,
     holding_id: str = Path(..., description="The holding ID"),
     payment_request: PaymentConfirmRequest = None,
 ):
@@ -37,14 +101,13 @@ async def confirm_booking(
                 status_code=400, detail="Payment failed. Booking not confirmed."
             )
 
-        # Find the holding record by scanning for holding_id
-        # We need to scan because holdings are stored with event_id as pk
-        holdings_result = db_client.scan_items(
-            filter_expression="holding_id = :holding_id AND begins_with(sk, :holding_prefix)",
-            expression_values={
-                ":holding_id": holding_id,
-                ":holding_prefix": "holding-",
-            },
+        # Find the holding record by holding_id
+        holdings_result = await _find_record(
+            holding_id,
+            "holding_id = :holding_id AND begins_with(sk, :holding_prefix)",
+            {":holding_id": holding_id, ":holding_prefix": "holding-"},
+            lambda item: item.get("holding_id") == holding_id
+            and item["sk"].startswith("holding-"),
         )
 
         if holdings_result["status"] == "error":
@@ -85,31 +148,6 @@ async def confirm_booking(
         if not seats:
             raise HTTPException(status_code=500, detail="Holding record missing seats")
 
-        # Validate event still exists
-        event_result = db_client.get_item(event_id, "EVENT")
-        if event_result["status"] == "not_found":
-            raise HTTPException(
-                status_code=404,
-                detail="Event no longer exists. Booking cannot be confirmed.",
-            )
-        elif event_result["status"] == "error":
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error validating event: {event_result['error']}",
-            )
-
-        # Validate user still exists
-        user_result = db_client.get_item(user_id, "USER")
-        if user_result["status"] == "not_found":
-            raise HTTPException(
-                status_code=404,
-                detail="User no longer exists. Booking cannot be confirmed.",
-            )
-        elif user_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error validating user: {user_result['error']}"
-            )
-
         # Verify the holding is still valid (not expired)
         created_at = holding_record["created_at"]
         ttl = holding_record["ttl"]
@@ -123,41 +161,8 @@ async def confirm_booking(
                 detail="Holding has expired. Please try holding seats again.",
             )
 
-        # Validate all seats are still held by this holding
-        seats_result = db_client.query_items(event_id)
-        if seats_result["status"] == "error":
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to validate seat states: {seats_result['error']}",
-            )
-
-        # Create seat map for validation
-        seat_map = {}
-        for item in seats_result["items"]:
-            if item.get("sk") != "EVENT":  # Skip the event object itself
-                seat_map[item.get("seat_pos")] = item
-
-        # Validate each seat is still held by this holding
-        invalid_seats = []
-        for seat_pos in seats:
-            if seat_pos not in seat_map:
-                invalid_seats.append(f"{seat_pos} (seat not found)")
-                continue
-
-            seat = seat_map[seat_pos]
-            seat_state = seat.get("seat_state")
-            seat_holding_id = seat.get("holding_id")
-
-            if seat_state != "held":
-                invalid_seats.append(f"{seat_pos} (state: {seat_state})")
-            elif seat_holding_id != holding_id:
-                invalid_seats.append(f"{seat_pos} (held by different holding)")
-
-        if invalid_seats:
-            raise HTTPException(
-                status_code=409,
-                detail=f"Seats are no longer available for confirmation: {invalid_seats}",
-            )
+        # The event and user still existing and the seats still being held by
+        # this holding are checked by the transaction
 
         # Generate booking ID
         booking_id = generate_booking_id()
@@ -173,11 +178,42 @@ async def confirm_booking(
         )
 
         # Execute transaction
-        transaction_result = db_client.transact_write(transact_items)
+        transaction_result = await db_client.transact_write(transact_items)
 
         if transaction_result["status"] == "error":
             # Check specific error types for better error messages
             error_str = str(transaction_result["error"])
+
+            # The event and user condition checks are the last two items
+            reasons = [
+                reason.get("Code")
+                for reason in transaction_result.get("cancellation_reasons", [])
+            ]
+            if len(reasons) == len(transact_items):
+                if reasons[-2] == "ConditionalCheckFailed":
+                    raise HTTPException(
+                        status_code=404,
+                        detail="Event no longer exists. Booking cannot be confirmed.",
+                    )
+                if reasons[-1] == "ConditionalCheckFailed":
+                    raise HTTPException(
+                        status_code=404,
+                        detail="User no longer exists. Booking cannot be confirmed.",
+                    )
+
+                # Seat updates follow the booking record put
+                invalid_seats = await _invalid_seats(
+                    event_id, seats, reasons[1 : len(seats) + 1], "held", "holding"
+                )
+                if invalid_seats:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=(
+                            "Seats are no longer available for confirmation: "
+                            f"{invalid_seats}"
+                        ),
+                    )
+
             if "ConditionalCheckFailed" in error_str:
                 raise HTTPException(
                     status_code=409,
@@ -194,27 +230,14 @@ async def confirm_booking(
                     detail=f"Failed to confirm booking: {transaction_result['error']}",
                 )
 
-        # Update event analytics (non-blocking)
-        try:
-            # Increment successful bookings
-            db_client.update_item_conditional(
-                event_id,
-                "EVENT",
-                "ADD successful_bookings :inc",
-                "attribute_exists(pk)",
-                {":inc": 1},
-            )
-            # Increment seats sold
-            db_client.update_item_conditional(
-                event_id,
-                "EVENT",
-                "ADD seats_sold :inc",
-                "attribute_exists(pk)",
-                {":inc": len(seats)},
-            )
-        except Exception:
-            # Analytics update failure shouldn't break the booking
-            pass
+        # Update the event's counters after the response is sent (analytics
+        # counts bookings from the bookings themselves, not from these)
+        background_tasks.add_task(
+            update_event_analytics,
+            event_id,
+            "ADD successful_bookings :inc, seats_sold :seats",
+            {":inc": 1, ":seats": len(seats)},
+        )
 
         return BookingResponse(
             booking_id=booking_id,
@@ -234,15 +257,19 @@ async def confirm_booking(
 
 @router.post("/{booking_id}/cancel", response_model=dict)
 async def cancel_booking(
+    background_tasks: BackgroundTasks,
     booking_id: str = Path(..., description="The booking ID"),
     cancel_request: BookingCancelRequest = None,
 ):
     """Cancel a booking and free the seats with comprehensive validation"""
     try:
-        # Find the booking record by scanning for booking_id
-        bookings_result = db_client.scan_items(
-            filter_expression="booking_id = :booking_id",
-            expression_values={":booking_id": booking_id},
+        # Find the booking record by booking_id
+        bookings_result = await _find_record(
+            booking_id,
+            "booking_id = :booking_id",
+            {":booking_id": booking_id},
+            lambda item: item.get("booking_id") == booking_id
+            and not item["sk"].startswith("holding-"),
         )
 
         if bookings_result["status"] == "error":
@@ -283,58 +310,12 @@ async def cancel_booking(
         if not seats:
             raise HTTPException(status_code=500, detail="Booking record missing seats")
 
-        # Validate event still exists
-        event_result = db_client.get_item(event_id, "EVENT")
-        if event_result["status"] == "not_found":
-            raise HTTPException(
-                status_code=404,
-                detail="Event no longer exists. Booking cannot be cancelled.",
-            )
-        elif event_result["status"] == "error":
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error validating event: {event_result['error']}",
-            )
-
         # Check if booking is already cancelled
         if booking_record["state"] == "cancelled":
             raise HTTPException(status_code=400, detail="Booking is already cancelled")
 
-        # Validate all seats are still booked by this booking
-        seats_result = db_client.query_items(event_id)
-        if seats_result["status"] == "error":
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to validate seat states: {seats_result['error']}",
-            )
-
-        # Create seat map for validation
-        seat_map = {}
-        for item in seats_result["items"]:
-            if item.get("sk") != "EVENT":  # Skip the event object itself
-                seat_map[item.get("seat_pos")] = item
-
-        # Validate each seat is still booked by this booking
-        invalid_seats = []
-        for seat_pos in seats:
-            if seat_pos not in seat_map:
-                invalid_seats.append(f"{seat_pos} (seat not found)")
-                continue
-
-            seat = seat_map[seat_pos]
-            seat_state = seat.get("seat_state")
-            seat_booking_id = seat.get("booking_id")
-
-            if seat_state != "booked":
-                invalid_seats.append(f"{seat_pos} (state: {seat_state})")
-            elif seat_booking_id != booking_id:
-                invalid_seats.append(f"{seat_pos} (booked by different booking)")
-
-        if invalid_seats:
-            raise HTTPException(
-                status_code=409,
-                detail=f"Seats are no longer available for cancellation: {invalid_seats}",
-            )
+        # The event still existing and the seats still being booked by this
+        # booking are checked by the transaction
 
         # Create enhanced transaction items for cancelling booking
         transact_items = create_enhanced_cancellation_transaction_items(
@@ -342,11 +323,37 @@ async def cancel_booking(
         )
 
         # Execute transaction
-        transaction_result = db_client.transact_write(transact_items)
+        transaction_result = await db_client.transact_write(transact_items)
 
         if transaction_result["status"] == "error":
             # Check specific error types for better error messages
             error_str = str(transaction_result["error"])
+
+            # Seat updates come first, then the booking update
+            reasons = [
+                reason.get("Code")
+                for reason in transaction_result.get("cancellation_reasons", [])
+            ]
+            if len(reasons) == len(transact_items):
+                # The event condition check is the last item
+                if reasons[-1] == "ConditionalCheckFailed":
+                    raise HTTPException(
+                        status_code=404,
+                        detail="Event no longer exists. Booking cannot be cancelled.",
+                    )
+
+                invalid_seats = await _invalid_seats(
+                    event_id, seats, reasons[: len(seats)], "booked", "booking"
+                )
+                if invalid_seats:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=(
+                            "Seats are no longer available for cancellation: "
+                            f"{invalid_seats}"
+                        ),
+                    )
+
             if "ConditionalCheckFailed" in error_str:
                 raise HTTPException(
                     status_code=409,
@@ -363,27 +370,13 @@ async def cancel_booking(
                     detail=f"Failed to cancel booking: {transaction_result['error']}",
                 )
 
-        # Update event analytics (non-blocking)
-        try:
-            # Increment cancellations
-            db_client.update_item_conditional(
-                event_id,
-                "EVENT",
-                "ADD cancellations :inc",
-                "attribute_exists(pk)",
-                {":inc": 1},
-            )
-            # Decrement seats sold
-            db_client.update_item_conditional(
-                event_id,
-                "EVENT",
-                "ADD seats_sold :inc",
-                "attribute_exists(pk)",
-                {":inc": -len(seats)},
-            )
-        except Exception:
-            # Analytics update failure shouldn't break the cancellation
-            pass
+        # Update the event's counters after the response is sent
+        background_tasks.add_task(
+            update_event_analytics,
+            event_id,
+            "ADD cancellations :inc, seats_sold :seats",
+            {":inc": 1, ":seats": -len(seats)},
+        )
 
         return {
             "message": "Booking cancelled successfully",
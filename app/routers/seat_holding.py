@@ -1,90 +1,94 @@
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Path
 
 from app.database import db_client
 from app.models.event import SeatHoldRequest, SeatHoldResponse
-from app.utils import (create_hold_transaction_items, generate_holding_id,
-                       get_current_timestamp, get_hold_expiry_time,
-                       is_hold_expired)
+from app.utils import (MAX_SEATS_PER_HOLD, create_hold_transaction_items,
+                       generate_holding_id, get_current_timestamp,
+                       get_hold_expiry_time, is_hold_expired,
+                       update_event_analytics)
 
 router = APIRouter(tags=["seat-holding"])
 
+# Seat attributes the hold checks read
+HOLD_SEAT_FIELDS = ["seat_pos", "seat_state", "holding_id", "hold_ttl", "created_at"]
+
+
+def _is_taken(seat: dict) -> bool:
+    """Whether a seat is booked or under a hold that has not expired"""
+    seat_state = seat.get("seat_state")
+    if seat_state == "booked":
+        return True
+    if seat_state == "held":
+        hold_ttl = seat.get("hold_ttl")
+        created_at = seat.get("created_at")
+        # A hold with missing data is treated as expired
+        if seat.get("holding_id") and hold_ttl and created_at:
+            return not is_hold_expired(hold_ttl, created_at)
+    return False
+
 
 @router.post("/events/{event_id}/hold", response_model=SeatHoldResponse)
 async def hold_event_seats(
+    background_tasks: BackgroundTasks,
     event_id: str = Path(..., description="The event ID"),
     hold_request: SeatHoldRequest = None,
 ):
     """Hold seats for an event with atomic transaction"""
     try:
-        # First verify event exists
-        event_result = db_client.get_item(event_id, "EVENT")
-        if event_result["status"] == "not_found":
-            raise HTTPException(
-                status_code=404, detail=f"Event with ID {event_id} not found"
-            )
-        elif event_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error checking event: {event_result['error']}"
-            )
+        # Remove duplicate seats from request while preserving order
+        unique_seats = list(dict.fromkeys(hold_request.seats))
 
-        # Verify user exists
-        user_result = db_client.get_item(hold_request.user_id, "USER")
-        if user_result["status"] == "not_found":
+        # Larger holds could never be confirmed in one transaction
+        if len(unique_seats) > MAX_SEATS_PER_HOLD:
             raise HTTPException(
-                status_code=404, detail=f"User with ID {hold_request.user_id} not found"
-            )
-        elif user_result["status"] == "error":
-            raise HTTPException(
-                status_code=500, detail=f"Error checking user: {user_result['error']}"
+                status_code=400,
+                detail=f"A hold can include at most {MAX_SEATS_PER_HOLD} seats",
             )
 
-        # Get all event seats to check availability
-        seats_result = db_client.query_items(event_id)
+        # Read the event and just the requested seats in one batch
+        seats_result = await db_client.batch_get_items(
+            [(event_id, "EVENT")] + [(event_id, seat_pos) for seat_pos in unique_seats],
+            projection=HOLD_SEAT_FIELDS,
+        )
         if seats_result["status"] == "error":
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to fetch event seats: {seats_result['error']}",
             )
 
-        # Create a map of seat positions to seat data
-        seat_map = {}
-        for item in seats_result["items"]:
-            if item.get("sk") != "EVENT":  # Skip the event object itself
-                seat_map[item.get("seat_pos")] = item
-
-        # Validate requested seats exist and check availability
-        unavailable_seats = []
-        expired_holds = []
+        # Verify event exists
+        if not any(item["sk"] == "EVENT" for item in seats_result["items"]):
+            raise HTTPException(
+                status_code=404, detail=f"Event with ID {event_id} not found"
+            )
 
-        for seat_pos in hold_request.seats:
-            if seat_pos not in seat_map:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Seat {seat_pos} does not exist for this event",
-                )
+        # Create a map of seat positions to seat data (a requested position
+        # can also match a non-seat item such as "EVENT", which has no seat_pos)
+        seat_map = {
+            item["seat_pos"]: item
+            for item in seats_result["items"]
+            if "seat_pos" in item
+        }
+
+        # Validate requested seats exist, reporting every missing seat at once
+        missing_seats = [
+            seat_pos for seat_pos in unique_seats if seat_pos not in seat_map
+        ]
+        if missing_seats:
+            raise HTTPException(
+                status_code=400,
+                detail="; ".join(
+                    f"Seat {seat_pos} does not exist for this event"
+                    for seat_pos in missing_seats
+                ),
+            )
 
-            seat = seat_map[seat_pos]
-            seat_state = seat.get("seat_state")
-            holding_id = seat.get("holding_id")
-            hold_ttl = seat.get("hold_ttl")
-            created_at = seat.get("created_at")
-
-            if seat_state == "available":
-                continue  # Seat is available
-            elif seat_state == "booked":
-                unavailable_seats.append(seat_pos)
-            elif seat_state == "held":
-                # Check if hold has expired
-                if holding_id and hold_ttl and created_at:
-                    if is_hold_expired(hold_ttl, created_at):
-                        expired_holds.append(seat_pos)
-                    else:
-                        unavailable_seats.append(seat_pos)
-                else:
-                    # Invalid hold data, consider it expired
-                    expired_holds.append(seat_pos)
+        # Check availability (expired holds can be taken over)
+        unavailable_seats = [
+            seat_pos for seat_pos in unique_seats if _is_taken(seat_map[seat_pos])
+        ]
 
         # If any seats are unavailable (not expired), return error
         if unavailable_seats:
@@ -92,8 +96,20 @@ async def hold_event_seats(
                 status_code=409, detail=f"Seats are not available: {unavailable_seats}"
             )
 
-        # Handle empty seat list
+        # Handle empty seat list (no transaction runs, so check the user here)
         if not hold_request.seats:
+            user_result = await db_client.get_item(hold_request.user_id, "USER")
+            if user_result["status"] == "not_found":
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"User with ID {hold_request.user_id} not found",
+                )
+            elif user_result["status"] == "error":
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Error checking user: {user_result['error']}",
+                )
+
             return SeatHoldResponse(
                 holding_id="",
                 seats_held=[],
@@ -101,14 +117,6 @@ async def hold_event_seats(
                 expires_at=get_hold_expiry_time(180),
             )
 
-        # Remove duplicate seats from request while preserving order
-        unique_seats = []
-        seen = set()
-        for seat in hold_request.seats:
-            if seat not in seen:
-                unique_seats.append(seat)
-                seen.add(seat)
-
         # Generate holding ID and create transaction
         holding_id = generate_holding_id()
         ttl = 180  # 3 minutes
@@ -119,9 +127,23 @@ async def hold_event_seats(
         )
 
         # Execute transaction
-        transaction_result = db_client.transact_write(transact_items)
+        transaction_result = await db_client.transact_write(transact_items)
 
         if transaction_result["status"] == "error":
+            # The user condition check is the last item
+            reasons = [
+                reason.get("Code")
+                for reason in transaction_result.get("cancellation_reasons", [])
+            ]
+            if (
+                len(reasons) == len(transact_items)
+                and reasons[-1] == "ConditionalCheckFailed"
+            ):
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"User with ID {hold_request.user_id} not found",
+                )
+
             # Check if it's a conditional check failure (seat became unavailable)
             if "ConditionalCheckFailed" in str(transaction_result["error"]):
                 raise HTTPException(
@@ -134,18 +156,11 @@ async def hold_event_seats(
                     detail=f"Failed to hold seats: {transaction_result['error']}",
                 )
 
-        # Update event analytics
-        try:
-            update_analytics_result = db_client.update_item_conditional(
-                event_id,
-                "EVENT",
-                "ADD hold_attempts :inc",
-                "attribute_exists(pk)",
-                {":inc": 1},
-            )
-        except Exception:
-            # Analytics update failure shouldn't break the hold
-            pass
+        # Count the attempt after the response is sent, outside the
+        # transaction, so holds on one event don't contend on the event item
+        background_tasks.add_task(
+            update_event_analytics, event_id, "ADD hold_attempts :inc", {":inc": 1}
+        )
 
         return SeatHoldResponse(
             holding_id=holding_id,
@@ -1,10 +1,13 @@
-import uuid
+import secrets
 from datetime import datetime
+from operator import itemgetter
 from typing import List
 
 from fastapi import APIRouter, HTTPException, Path
+from fastapi.responses import ORJSONResponse
 
-from app.database import db_client
+from app.database import (BOOKINGS_BY_USER_INDEX, PARALLEL_SCAN_SEGMENTS,
+                          db_client)
 from app.models.user import UserBookingResponse, UserCreate, UserResponse
 
 router = APIRouter(tags=["users"])
@@ -12,7 +15,7 @@ router = APIRouter(tags=["users"])
 
 def generate_user_id() -> str:
     """Generate a unique user ID"""
-    return f"user-{str(uuid.uuid4())[:8]}"
+    return f"user-{secrets.token_hex(4)}"
 
 
 @router.post("/user", response_model=UserResponse)
@@ -33,7 +36,7 @@ async def create_user(user_data: UserCreate):
         }
 
         # Put user into DynamoDB
-        result = db_client.put_item(user_item)
+        result = await db_client.put_item(user_item)
 
         if result["status"] == "error":
             raise HTTPException(
@@ -55,7 +58,7 @@ async def create_user(user_data: UserCreate):
 async def get_user(user_id: str = Path(..., description="The user ID")):
     """Get a specific user by ID"""
     try:
-        result = db_client.get_item(user_id, "USER")
+        result = await db_client.get_item(user_id, "USER")
 
         if result["status"] == "not_found":
             raise HTTPException(
@@ -80,12 +83,16 @@ async def get_user(user_id: str = Path(..., description="The user ID")):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.get("/user/{user_id}/bookings", response_model=List[UserBookingResponse])
+@router.get(
+    "/user/{user_id}/bookings",
+    response_model=None,
+    responses={200: {"model": List[UserBookingResponse]}},
+)
 async def get_user_bookings(user_id: str = Path(..., description="The user ID")):
     """Get all bookings for a specific user, sorted by time"""
     try:
         # First verify user exists
-        user_result = db_client.get_item(user_id, "USER")
+        user_result = await db_client.get_item(user_id, "USER")
         if user_result["status"] == "not_found":
             raise HTTPException(
                 status_code=404, detail=f"User with ID {user_id} not found"
@@ -95,13 +102,18 @@ async def get_user_bookings(user_id: str = Path(..., description="The user ID"))
                 status_code=500, detail=f"Error checking user: {user_result['error']}"
             )
 
-        # Query all bookings for this user using GSI
-        # Note: This assumes we have a GSI with user_id as partition key
-        # For now, we'll scan for bookings with user_id
-        filter_expression = "sk = :sk AND user_id = :user_id"
-        expression_values = {":sk": "BOOKING", ":user_id": user_id}
-
-        result = db_client.scan_items(filter_expression, expression_values)
+        # Query the user's bookings from the user GSI when the table has it;
+        # otherwise scan for them (bookings are the items with a user_id and
+        # a booking_date; holdings carry user_id only)
+        from_index = await db_client.has_index(BOOKINGS_BY_USER_INDEX)
+        if from_index:
+            result = await db_client.query_gsi(BOOKINGS_BY_USER_INDEX, user_id)
+        else:
+            result = await db_client.scan_items(
+                "user_id = :user_id AND attribute_exists(booking_date)",
+                {":user_id": user_id},
+                segments=PARALLEL_SCAN_SEGMENTS,
+            )
 
         if result["status"] == "error":
             raise HTTPException(
@@ -109,22 +121,25 @@ async def get_user_bookings(user_id: str = Path(..., description="The user ID"))
                 detail=f"Failed to fetch user bookings: {result['error']}",
             )
 
-        bookings = []
-        for item in result["items"]:
-            bookings.append(
-                UserBookingResponse(
-                    booking_id=item["booking_id"],
-                    event_id=item["event_id"],
-                    seats=item["seats"],
-                    booking_date=item["booking_date"],
-                    state=item["state"],
-                )
-            )
-
-        # Sort by booking date (most recent first)
-        bookings.sort(key=lambda x: x.booking_date, reverse=True)
-
-        return bookings
+        bookings = [
+            {
+                "booking_id": item["booking_id"],
+                "event_id": item["event_id"],
+                "seats": list(item["seats"]),
+                "booking_date": item["booking_date"],
+                "state": item["state"],
+            }
+            for item in result["items"]
+        ]
+
+        # Most recent first; the index already returns bookings oldest first
+        if from_index:
+            bookings.reverse()
+        else:
+            bookings.sort(key=itemgetter("booking_date"), reverse=True)
+
+        # Serialize straight to JSON, skipping the response_model validation
+        return ORJSONResponse(content=bookings)
 
     except HTTPException:
         raise
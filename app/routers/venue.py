@@ -1,18 +1,23 @@
-import uuid
+import secrets
 from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Path
+from fastapi.responses import ORJSONResponse
 
-from app.database import db_client
+from app.database import (ENTITIES_BY_CITY_INDEX, PARALLEL_SCAN_SEGMENTS,
+                          VENUE_ENTITY_TYPE, city_key, db_client)
 from app.models.venue import VenueCreate, VenueResponse
 
 router = APIRouter(tags=["venues"])
 
+# Attributes read for venue listings
+VENUE_RESPONSE_FIELDS = list(VenueResponse.model_fields)
+
 
 def generate_venue_id() -> str:
     """Generate a unique venue ID"""
-    return f"venue-{str(uuid.uuid4())[:8]}"
+    return f"venue-{secrets.token_hex(4)}"
 
 
 @router.post("/venue", response_model=VenueResponse)
@@ -26,16 +31,19 @@ async def create_venue(venue_data: VenueCreate):
         venue_item = {
             "pk": venue_id,
             "sk": "VENUE",
+            # Puts the venue in the entity city GSI used to list venues
+            "entity_type": VENUE_ENTITY_TYPE,
             "venue_id": venue_id,
             "name": venue_data.name,
             "city": venue_data.city,
+            "city_key": city_key(venue_data.city),
             "description": venue_data.description,
             "seat_types": venue_data.seat_types,
             "created_at": current_time.isoformat(),
         }
 
         # Put item into DynamoDB
-        result = db_client.put_item(venue_item)
+        result = await db_client.put_item(venue_item)
 
         if result["status"] == "error":
             raise HTTPException(
@@ -55,39 +63,53 @@ async def create_venue(venue_data: VenueCreate):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.get("/venue", response_model=List[VenueResponse])
+@router.get(
+    "/venue", response_model=None, responses={200: {"model": List[VenueResponse]}}
+)
 async def get_venues(city: str = None):
-    """Get all venues, optionally filtered by city"""
+    """Get all venues, optionally filtered by city (case-insensitive)"""
     try:
-        # Scan for all venues (items with sk="VENUE")
-        filter_expression = "sk = :sk"
-        expression_values = {":sk": "VENUE"}
-
-        if city:
-            filter_expression += " AND city = :city"
-            expression_values[":city"] = city
-
-        result = db_client.scan_items(filter_expression, expression_values)
+        # Query only venue items when the table has the entity city GSI
+        from_index = await db_client.has_index(ENTITIES_BY_CITY_INDEX)
+        if from_index:
+            result = await db_client.query_venues(
+                city, projection=VENUE_RESPONSE_FIELDS
+            )
+        else:
+            # Scan for all venues (items with sk="VENUE")
+            result = await db_client.scan_items(
+                "sk = :sk",
+                {":sk": "VENUE"},
+                segments=PARALLEL_SCAN_SEGMENTS,
+                projection=VENUE_RESPONSE_FIELDS,
+            )
 
         if result["status"] == "error":
             raise HTTPException(
                 status_code=500, detail=f"Failed to fetch venues: {result['error']}"
             )
 
-        venues = []
-        for item in result["items"]:
-            venues.append(
-                VenueResponse(
-                    venue_id=item["venue_id"],
-                    name=item["name"],
-                    city=item["city"],
-                    description=item["description"],
-                    seat_types=item["seat_types"],
-                    created_at=item["created_at"],
-                )
-            )
-
-        return venues
+        items = result["items"]
+        if city and not from_index:
+            # Older venues lack city_key, so the scan matches on city itself
+            # with the same normalization the GSI uses
+            wanted = city_key(city)
+            items = [item for item in items if city_key(item["city"]) == wanted]
+
+        # Serialize straight to JSON, skipping the response_model validation
+        venues = [
+            {
+                "venue_id": item["venue_id"],
+                "name": item["name"],
+                "city": item["city"],
+                "description": item["description"],
+                "seat_types": list(item["seat_types"]),
+                "created_at": item["created_at"],
+            }
+            for item in items
+        ]
+
+        return ORJSONResponse(content=venues)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -97,7 +119,7 @@ async def get_venues(city: str = None):
 async def get_venue(venue_id: str = Path(..., description="The venue ID")):
     """Get a specific venue by ID"""
     try:
-        result = db_client.get_item(venue_id, "VENUE")
+        result = await db_client.get_item(venue_id, "VENUE")
 
         if result["status"] == "not_found":
             raise HTTPException(
@@ -129,7 +151,7 @@ async def delete_venue(venue_id: str = Path(..., description="The venue ID")):
     """Delete a venue (soft delete by marking as deleted)"""
     try:
         # First check if venue exists
-        result = db_client.get_item(venue_id, "VENUE")
+        result = await db_client.get_item(venue_id, "VENUE")
 
         if result["status"] == "not_found":
             raise HTTPException(
@@ -140,10 +162,10 @@ async def delete_venue(venue_id: str = Path(..., description="The venue ID")):
                 status_code=500, detail=f"Error checking venue: {result['error']}"
             )
 
-        # Check if venue has seats
-        seats_result = db_client.query_items(venue_id)
+        # Check if venue has seats (two items are enough to tell)
+        seats_result = await db_client.query_count(venue_id, limit=2)
         if (
-            seats_result["status"] == "success" and len(seats_result["items"]) > 1
+            seats_result["status"] == "success" and seats_result["count"] > 1
         ):  # More than just the venue object
             raise HTTPException(
                 status_code=400,
@@ -1,9 +1,11 @@
 from typing import List
 
 from fastapi import APIRouter, HTTPException, Path
+from fastapi.responses import ORJSONResponse
 
-from app.database import db_client
+from app.database import TRANSACT_WRITE_LIMIT, db_client
 from app.models.seat import SeatCreate, SeatResponse, VenueSeatCreate
+from app.utils import create_venue_seat_transaction_items
 
 router = APIRouter(tags=["venue-seats"])
 
@@ -13,79 +15,137 @@ def create_seat_pos(row: str, seat_num: int) -> str:
     return f"{row}-{seat_num}"
 
 
-@router.post("/venue/{venue_id}/seats", response_model=List[SeatResponse])
+def _collision_error(venue_id: str, collisions: List[str]) -> HTTPException:
+    """409 naming every seat position that already exists"""
+    if len(collisions) == 1:
+        return HTTPException(
+            status_code=409,
+            detail=f"Seat {collisions[0]} already exists for venue {venue_id}",
+        )
+    return HTTPException(
+        status_code=409,
+        detail=f"Seats {', '.join(collisions)} already exist for venue {venue_id}",
+    )
+
+
+@router.post(
+    "/venue/{venue_id}/seats",
+    response_model=None,
+    responses={200: {"model": List[SeatResponse]}},
+)
 async def create_venue_seats(
     venue_id: str = Path(..., description="The venue ID"),
     seat_data: VenueSeatCreate = None,
 ):
     """Add seats to a specific venue"""
     try:
-        # First, verify that the venue exists
-        venue_result = db_client.get_item(venue_id, "VENUE")
-        if venue_result["status"] == "not_found":
+        seat_positions = [
+            create_seat_pos(seat.row, seat.seat_num) for seat in seat_data.seats
+        ]
+
+        # Read the venue and any seats already at the requested positions in
+        # one batch
+        batch_result = await db_client.batch_get_items(
+            [(venue_id, "VENUE")]
+            + [(venue_id, seat_pos) for seat_pos in seat_positions],
+            projection=["seat_types"],
+        )
+
+        if batch_result["status"] == "error":
             raise HTTPException(
-                status_code=404, detail=f"Venue with ID {venue_id} not found"
+                status_code=500, detail=f"Error checking venue: {batch_result['error']}"
             )
-        elif venue_result["status"] == "error":
+
+        existing = {item["sk"]: item for item in batch_result["items"]}
+
+        # Verify that the venue exists
+        venue = existing.pop("VENUE", None)
+        if venue is None:
             raise HTTPException(
-                status_code=500, detail=f"Error checking venue: {venue_result['error']}"
+                status_code=404, detail=f"Venue with ID {venue_id} not found"
             )
 
-        venue = venue_result["item"]
         venue_seat_types = venue.get("seat_types", [])
+        valid_seat_types = set(venue_seat_types)
 
-        created_seats = []
-
-        # Process each seat
-        for seat in seat_data.seats:
+        # Validate seat types and build every seat item before writing any
+        seat_items = []
+        for seat, seat_pos in zip(seat_data.seats, seat_positions):
             # Validate seat type exists in venue
-            if seat.seat_type not in venue_seat_types:
+            if seat.seat_type not in valid_seat_types:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Seat type '{seat.seat_type}' not valid for this venue. Available types: {venue_seat_types}",
                 )
 
-            seat_pos = create_seat_pos(seat.row, seat.seat_num)
-
-            # Check if seat already exists
-            existing_seat = db_client.get_item(venue_id, seat_pos)
-            if existing_seat["status"] == "success":
-                raise HTTPException(
-                    status_code=409,
-                    detail=f"Seat {seat_pos} already exists for venue {venue_id}",
-                )
-
-            # Create seat item for DynamoDB
-            seat_item = {
-                "pk": venue_id,
-                "sk": seat_pos,
-                "venue_id": venue_id,
-                "row": seat.row,
-                "seat_num": seat.seat_num,
-                "seat_type": seat.seat_type,
-                "seat_pos": seat_pos,
-            }
+            seat_items.append(
+                {
+                    "pk": venue_id,
+                    "sk": seat_pos,
+                    "venue_id": venue_id,
+                    "row": seat.row,
+                    "seat_num": seat.seat_num,
+                    "seat_type": seat.seat_type,
+                    "seat_pos": seat_pos,
+                }
+            )
 
-            # Put seat into DynamoDB
-            result = db_client.put_item(seat_item)
+        # Seats that already exist or repeat within the request collide
+        collisions = list(existing)
+
+        seen = set()
+        for seat_pos in seat_positions:
+            if seat_pos in seen:
+                collisions.append(seat_pos)
+            seen.add(seat_pos)
+        collisions = list(dict.fromkeys(collisions))
+
+        if collisions:
+            raise _collision_error(venue_id, collisions)
+
+        # Put seats in transactions of up to 100, each put conditional on the
+        # seat not existing, so a seat created by a concurrent request after
+        # the read above is never overwritten
+        transact_items = create_venue_seat_transaction_items(seat_items)
+        for i in range(0, len(transact_items), TRANSACT_WRITE_LIMIT):
+            chunk = transact_items[i : i + TRANSACT_WRITE_LIMIT]
+            result = await db_client.transact_write(chunk)
+            if result["status"] == "success":
+                continue
 
-            if result["status"] == "error":
+            # A seat that lost the race cancels its chunk; earlier chunks are
+            # already written and later ones are not attempted
+            reasons = [
+                reason.get("Code") for reason in result.get("cancellation_reasons", [])
+            ]
+            if len(reasons) != len(chunk) or "ConditionalCheckFailed" not in reasons:
                 raise HTTPException(
                     status_code=500,
-                    detail=f"Failed to create seat {seat_pos}: {result['error']}",
-                )
-
-            created_seats.append(
-                SeatResponse(
-                    venue_id=venue_id,
-                    row=seat.row,
-                    seat_num=seat.seat_num,
-                    seat_type=seat.seat_type,
-                    seat_pos=seat_pos,
+                    detail=f"Failed to create seats: {result['error']}",
                 )
+            raise _collision_error(
+                venue_id,
+                [
+                    item["Put"]["Item"]["seat_pos"]["S"]
+                    for item, reason in zip(chunk, reasons)
+                    if reason == "ConditionalCheckFailed"
+                ],
             )
 
-        return created_seats
+        # Serialize straight to JSON, skipping the response_model validation
+        # (the fields were validated on the way in)
+        return ORJSONResponse(
+            content=[
+                {
+                    "venue_id": venue_id,
+                    "row": item["row"],
+                    "seat_num": item["seat_num"],
+                    "seat_type": item["seat_type"],
+                    "seat_pos": item["seat_pos"],
+                }
+                for item in seat_items
+            ]
+        )
 
     except HTTPException:
         raise
@@ -93,12 +153,16 @@ async def create_venue_seats(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.get("/venue/{venue_id}/seats", response_model=List[SeatResponse])
+@router.get(
+    "/venue/{venue_id}/seats",
+    response_model=None,
+    responses={200: {"model": List[SeatResponse]}},
+)
 async def get_venue_seats(venue_id: str = Path(..., description="The venue ID")):
     """Get all seats for a specific venue"""
     try:
         # First, verify that the venue exists
-        venue_result = db_client.get_item(venue_id, "VENUE")
+        venue_result = await db_client.get_item(venue_id, "VENUE")
         if venue_result["status"] == "not_found":
             raise HTTPException(
                 status_code=404, detail=f"Venue with ID {venue_id} not found"
@@ -109,30 +173,28 @@ async def get_venue_seats(venue_id: str = Path(..., description="The venue ID"))
             )
 
         # Query all seats for this venue
-        result = db_client.query_items(venue_id)
+        result = await db_client.query_items(venue_id)
 
         if result["status"] == "error":
             raise HTTPException(
                 status_code=500, detail=f"Failed to fetch seats: {result['error']}"
             )
 
-        seats = []
-        for item in result["items"]:
-            # Skip the venue object itself (sk="VENUE")
-            if item.get("sk") == "VENUE":
-                continue
-
-            seats.append(
-                SeatResponse(
-                    venue_id=item["venue_id"],
-                    row=item["row"],
-                    seat_num=item["seat_num"],
-                    seat_type=item["seat_type"],
-                    seat_pos=item["seat_pos"],
-                )
-            )
+        # Serialize straight to JSON, skipping the response_model validation
+        # (skip the venue object itself, sk="VENUE")
+        seats = [
+            {
+                "venue_id": item["venue_id"],
+                "row": item["row"],
+                "seat_num": int(item["seat_num"]),
+                "seat_type": item["seat_type"],
+                "seat_pos": item["seat_pos"],
+            }
+            for item in result["items"]
+            if item.get("sk") != "VENUE"
+        ]
 
-        return seats
+        return ORJSONResponse(content=seats)
 
     except HTTPException:
         raise
@@ -1,18 +1,90 @@
-import uuid
-from datetime import datetime, timedelta
-from typing import Any, Dict, List
+import base64
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from app.database import db_client
+import orjson
+
+from app.database import TRANSACT_WRITE_LIMIT, booking_state_key, db_client
+
+logger = logging.getLogger(__name__)
+
+# Rows serialized per chunk of a streamed JSON array
+JSON_STREAM_CHUNK_ROWS = 500
+
+# Parsed timestamps kept for hold expiry checks (seats created together share
+# a created_at, so the same strings come up again and again)
+TIMESTAMP_CACHE_SIZE = 4096
+
+
+def _random_token() -> str:
+    """24 lowercase base32 characters carrying 120 random bits"""
+    return base64.b32encode(os.urandom(15)).decode().lower()
 
 
 def generate_holding_id() -> str:
     """Generate a unique holding ID"""
-    return f"holding-{str(uuid.uuid4())}"
+    return f"holding-{_random_token()}"
 
 
 def generate_booking_id() -> str:
     """Generate a unique booking ID"""
-    return f"booking-{str(uuid.uuid4())}"
+    return f"booking-{_random_token()}"
+
+
+def encode_cursor(last_key: Dict[str, Any]) -> str:
+    """Opaque pagination cursor for a DynamoDB LastEvaluatedKey"""
+    return base64.urlsafe_b64encode(json.dumps(last_key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Optional[Dict[str, Any]]:
+    """Decode a pagination cursor back into a start key (None if malformed)"""
+    try:
+        start_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        return None
+    return start_key if isinstance(start_key, dict) else None
+
+
+async def stream_json_array(
+    rows: AsyncIterator[Dict[str, Any]], chunk_rows: int = JSON_STREAM_CHUNK_ROWS
+) -> AsyncIterator[bytes]:
+    """Yield rows as one JSON array, serialized a chunk at a time as they arrive"""
+    yield b"["
+    chunk = []
+    first = True
+    async for row in rows:
+        chunk.append(orjson.dumps(row))
+        if len(chunk) >= chunk_rows:
+            yield (b"" if first else b",") + b",".join(chunk)
+            chunk = []
+            first = False
+
+    if chunk:
+        yield (b"" if first else b",") + b",".join(chunk)
+    yield b"]"
+
+
+async def update_event_analytics(
+    event_id: str, update_expression: str, expression_values: Dict[str, Any]
+) -> None:
+    """Apply an analytics counter update to the event item. The request being
+    counted has already succeeded, so a failed update is logged, not raised"""
+    result = await db_client.update_item_conditional(
+        event_id,
+        "EVENT",
+        update_expression,
+        "attribute_exists(pk)",
+        expression_values,
+    )
+    if result["status"] == "error":
+        logger.warning(
+            "Failed to update analytics for event %s: %s", event_id, result["error"]
+        )
 
 
 def get_current_timestamp() -> str:
@@ -26,22 +98,30 @@ def get_hold_expiry_time(ttl_seconds: int = 180) -> str:
     return expiry_time.isoformat()
 
 
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _epoch_seconds(timestamp: str) -> float:
+    """Parse an ISO timestamp to epoch seconds (naive timestamps are UTC)"""
+    parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
 def is_hold_expired(hold_ttl, created_at: str) -> bool:
     """Check if a hold has expired"""
     try:
-        # Convert hold_ttl to int if it's a Decimal
-        if hasattr(hold_ttl, "int_value"):
-            hold_ttl = hold_ttl.int_value()
-        else:
-            hold_ttl = int(hold_ttl)
-
-        created_time = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-        expiry_time = created_time + timedelta(seconds=hold_ttl)
-        return datetime.utcnow() > expiry_time
+        # int() also converts the Decimal DynamoDB returns for numbers
+        return time.time() > _epoch_seconds(created_at) + int(hold_ttl)
     except (ValueError, TypeError, AttributeError):
         return True  # If we can't parse the time, consider it expired
 
 
+# Most seats one hold can take: confirming it writes the booking, deletes the
+# holding and checks the event and user alongside one update per seat, all in
+# a single TransactWriteItems call
+MAX_SEATS_PER_HOLD = TRANSACT_WRITE_LIMIT - 4
+
+
 def create_hold_transaction_items(
     event_id: str, holding_id: str, user_id: str, seats: list, ttl: int = 180
 ) -> list:
@@ -59,6 +139,7 @@ def create_hold_transaction_items(
                 "pk": {"S": event_id},
                 "sk": {"S": holding_id},
                 "holding_id": {"S": holding_id},
+                "record_id": {"S": holding_id},
                 "event_id": {"S": event_id},
                 "user_id": {"S": user_id},
                 "seats": {"SS": list(seats)},
@@ -70,23 +151,38 @@ def create_hold_transaction_items(
     }
     transact_items.append(holding_item)
 
-    # Update each seat to held state
-    for seat_pos in seats:
-        seat_item = {
+    # Update each seat to held state (the partition key and values are the
+    # same for every seat, so they are built once and shared)
+    event_pk = {"S": event_id}
+    expression_values = {
+        ":state": {"S": "held"},
+        ":holding_id": {"S": holding_id},
+        ":ttl": {"N": str(ttl)},
+        ":available_state": {"S": "available"},
+    }
+    transact_items.extend(
+        {
             "Update": {
                 "TableName": db_client.table_name,
-                "Key": {"pk": {"S": event_id}, "sk": {"S": seat_pos}},
+                "Key": {"pk": event_pk, "sk": {"S": seat_pos}},
                 "UpdateExpression": "SET seat_state = :state, holding_id = :holding_id, hold_ttl = :ttl",
                 "ConditionExpression": "seat_state = :available_state",
-                "ExpressionAttributeValues": {
-                    ":state": {"S": "held"},
-                    ":holding_id": {"S": holding_id},
-                    ":ttl": {"N": str(ttl)},
-                    ":available_state": {"S": "available"},
-                },
+                "ExpressionAttributeValues": expression_values,
             }
         }
-        transact_items.append(seat_item)
+        for seat_pos in seats
+    )
+
+    # Check the user exists as part of the same transaction (last item)
+    transact_items.append(
+        {
+            "ConditionCheck": {
+                "TableName": db_client.table_name,
+                "Key": {"pk": {"S": user_id}, "sk": {"S": "USER"}},
+                "ConditionExpression": "attribute_exists(pk)",
+            }
+        }
+    )
 
     return transact_items
 
@@ -112,11 +208,13 @@ def create_booking_transaction_items(
                 "pk": {"S": event_id},
                 "sk": {"S": current_time},  # Use timestamp as sort key for ordering
                 "booking_id": {"S": booking_id},
+                "record_id": {"S": booking_id},
                 "event_id": {"S": event_id},
                 "user_id": {"S": user_id},
                 "seats": {"SS": list(seats)},
                 "booking_date": {"S": current_time},
                 "state": {"S": "confirmed"},
+                "event_state": {"S": booking_state_key(event_id, "confirmed")},
                 "payment_status": {"S": payment_status},
             },
         }
@@ -124,23 +222,26 @@ def create_booking_transaction_items(
     transact_items.append(booking_item)
 
     # Update each seat to booked state
-    for seat_pos in seats:
-        seat_item = {
+    event_pk = {"S": event_id}
+    expression_values = {
+        ":state": {"S": "booked"},
+        ":booking_id": {"S": booking_id},
+        ":null": {"NULL": True},
+        ":held_state": {"S": "held"},
+        ":holding_id": {"S": holding_id},
+    }
+    transact_items.extend(
+        {
             "Update": {
                 "TableName": db_client.table_name,
-                "Key": {"pk": {"S": event_id}, "sk": {"S": seat_pos}},
+                "Key": {"pk": event_pk, "sk": {"S": seat_pos}},
                 "UpdateExpression": "SET seat_state = :state, booking_id = :booking_id, holding_id = :null, hold_ttl = :null",
                 "ConditionExpression": "seat_state = :held_state AND holding_id = :holding_id",
-                "ExpressionAttributeValues": {
-                    ":state": {"S": "booked"},
-                    ":booking_id": {"S": booking_id},
-                    ":null": {"NULL": True},
-                    ":held_state": {"S": "held"},
-                    ":holding_id": {"S": holding_id},
-                },
+                "ExpressionAttributeValues": expression_values,
             }
         }
-        transact_items.append(seat_item)
+        for seat_pos in seats
+    )
 
     return transact_items
 
@@ -166,11 +267,13 @@ def create_enhanced_booking_transaction_items(
                 "pk": {"S": event_id},
                 "sk": {"S": current_time},  # Use timestamp as sort key for ordering
                 "booking_id": {"S": booking_id},
+                "record_id": {"S": booking_id},
                 "event_id": {"S": event_id},
                 "user_id": {"S": user_id},
                 "seats": {"SS": list(seats)},
                 "booking_date": {"S": current_time},
                 "state": {"S": "confirmed"},
+                "event_state": {"S": booking_state_key(event_id, "confirmed")},
                 "payment_status": {"S": payment_status},
             },
             "ConditionExpression": "attribute_not_exists(booking_id)",  # Prevent duplicate booking IDs
@@ -179,24 +282,27 @@ def create_enhanced_booking_transaction_items(
     transact_items.append(booking_item)
 
     # Update each seat to booked state with enhanced conditions
-    for seat_pos in seats:
-        seat_item = {
+    event_pk = {"S": event_id}
+    expression_values = {
+        ":state": {"S": "booked"},
+        ":booking_id": {"S": booking_id},
+        ":null": {"NULL": True},
+        ":held_state": {"S": "held"},
+        ":holding_id": {"S": holding_id},
+        ":updated_at": {"S": current_time},
+    }
+    transact_items.extend(
+        {
             "Update": {
                 "TableName": db_client.table_name,
-                "Key": {"pk": {"S": event_id}, "sk": {"S": seat_pos}},
+                "Key": {"pk": event_pk, "sk": {"S": seat_pos}},
                 "UpdateExpression": "SET seat_state = :state, booking_id = :booking_id, holding_id = :null, hold_ttl = :null, updated_at = :updated_at",
                 "ConditionExpression": "seat_state = :held_state AND holding_id = :holding_id AND attribute_exists(pk)",
-                "ExpressionAttributeValues": {
-                    ":state": {"S": "booked"},
-                    ":booking_id": {"S": booking_id},
-                    ":null": {"NULL": True},
-                    ":held_state": {"S": "held"},
-                    ":holding_id": {"S": holding_id},
-                    ":updated_at": {"S": current_time},
-                },
+                "ExpressionAttributeValues": expression_values,
             }
         }
-        transact_items.append(seat_item)
+        for seat_pos in seats
+    )
 
     # Delete the holding record to prevent reuse
     holding_delete_item = {
@@ -209,6 +315,21 @@ def create_enhanced_booking_transaction_items(
     }
     transact_items.append(holding_delete_item)
 
+    # Check the event and user still exist as part of the same transaction,
+    # instead of reading them first (these stay the last two items). Only
+    # ConditionChecks touch the event item, so confirms for one event don't
+    # conflict with each other over it
+    for pk, sk in ((event_id, "EVENT"), (user_id, "USER")):
+        transact_items.append(
+            {
+                "ConditionCheck": {
+                    "TableName": db_client.table_name,
+                    "Key": {"pk": {"S": pk}, "sk": {"S": sk}},
+                    "ConditionExpression": "attribute_exists(pk)",
+                }
+            }
+        )
+
     return transact_items
 
 
@@ -216,27 +337,26 @@ def create_cancellation_transaction_items(
     event_id: str, booking_id: str, seats: list
 ) -> list:
     """Create transaction items for cancelling a booking"""
-    transact_items = []
-
     # Update each seat back to available state
-    for seat_pos in seats:
-        seat_item = {
+    event_pk = {"S": event_id}
+    expression_values = {
+        ":state": {"S": "available"},
+        ":null": {"NULL": True},
+        ":booked_state": {"S": "booked"},
+        ":booking_id": {"S": booking_id},
+    }
+    return [
+        {
             "Update": {
                 "TableName": db_client.table_name,
-                "Key": {"pk": {"S": event_id}, "sk": {"S": seat_pos}},
+                "Key": {"pk": event_pk, "sk": {"S": seat_pos}},
                 "UpdateExpression": "SET seat_state = :state, booking_id = :null, holding_id = :null, hold_ttl = :null",
                 "ConditionExpression": "seat_state = :booked_state AND booking_id = :booking_id",
-                "ExpressionAttributeValues": {
-                    ":state": {"S": "available"},
-                    ":null": {"NULL": True},
-                    ":booked_state": {"S": "booked"},
-                    ":booking_id": {"S": booking_id},
-                },
+                "ExpressionAttributeValues": expression_values,
             }
         }
-        transact_items.append(seat_item)
-
-    return transact_items
+        for seat_pos in seats
+    ]
 
 
 def create_enhanced_cancellation_transaction_items(
@@ -247,34 +367,41 @@ def create_enhanced_cancellation_transaction_items(
     transact_items = []
 
     # Update each seat back to available state with enhanced conditions
-    for seat_pos in seats:
-        seat_item = {
+    event_pk = {"S": event_id}
+    expression_values = {
+        ":state": {"S": "available"},
+        ":null": {"NULL": True},
+        ":booked_state": {"S": "booked"},
+        ":booking_id": {"S": booking_id},
+        ":updated_at": {"S": current_time},
+    }
+    transact_items.extend(
+        {
             "Update": {
                 "TableName": db_client.table_name,
-                "Key": {"pk": {"S": event_id}, "sk": {"S": seat_pos}},
+                "Key": {"pk": event_pk, "sk": {"S": seat_pos}},
                 "UpdateExpression": "SET seat_state = :state, booking_id = :null, holding_id = :null, hold_ttl = :null, updated_at = :updated_at",
                 "ConditionExpression": "seat_state = :booked_state AND booking_id = :booking_id AND attribute_exists(pk)",
-                "ExpressionAttributeValues": {
-                    ":state": {"S": "available"},
-                    ":null": {"NULL": True},
-                    ":booked_state": {"S": "booked"},
-                    ":booking_id": {"S": booking_id},
-                    ":updated_at": {"S": current_time},
-                },
+                "ExpressionAttributeValues": expression_values,
             }
         }
-        transact_items.append(seat_item)
+        for seat_pos in seats
+    )
 
     # Update booking state to cancelled
     booking_update_item = {
         "Update": {
             "TableName": db_client.table_name,
             "Key": {"pk": {"S": event_id}, "sk": {"S": booking_sk}},
-            "UpdateExpression": "SET #state = :state, cancelled_at = :cancelled_at",
+            "UpdateExpression": (
+                "SET #state = :state, event_state = :event_state, "
+                "cancelled_at = :cancelled_at"
+            ),
             "ConditionExpression": "booking_id = :booking_id AND #state = :confirmed_state",
             "ExpressionAttributeNames": {"#state": "state"},
             "ExpressionAttributeValues": {
                 ":state": {"S": "cancelled"},
+                ":event_state": {"S": booking_state_key(event_id, "cancelled")},
                 ":booking_id": {"S": booking_id},
                 ":confirmed_state": {"S": "confirmed"},
                 ":cancelled_at": {"S": current_time},
@@ -283,4 +410,37 @@ def create_enhanced_cancellation_transaction_items(
     }
     transact_items.append(booking_update_item)
 
+    # Check the event still exists as part of the same transaction (last item)
+    transact_items.append(
+        {
+            "ConditionCheck": {
+                "TableName": db_client.table_name,
+                "Key": {"pk": {"S": event_id}, "sk": {"S": "EVENT"}},
+                "ConditionExpression": "attribute_exists(pk)",
+            }
+        }
+    )
+
     return transact_items
+
+
+def create_venue_seat_transaction_items(seat_items: List[Dict[str, Any]]) -> list:
+    """Create transaction items that put venue seats only where none exist yet"""
+    return [
+        {
+            "Put": {
+                "TableName": db_client.table_name,
+                "Item": {
+                    "pk": {"S": item["pk"]},
+                    "sk": {"S": item["sk"]},
+                    "venue_id": {"S": item["venue_id"]},
+                    "row": {"S": item["row"]},
+                    "seat_num": {"N": str(item["seat_num"])},
+                    "seat_type": {"S": item["seat_type"]},
+                    "seat_pos": {"S": item["seat_pos"]},
+                },
+                "ConditionExpression": "attribute_not_exists(sk)",
+            }
+        }
+        for item in seat_items
+    ]
@@ -8,8 +8,7 @@ from app.main import app
 client = TestClient(app)
 
 
-@pytest.fixture
-def test_event_with_bookings():
+def _create_event_with_bookings():
     """Create a test event with bookings for analytics tests"""
     # Create venue
     venue_data = {
@@ -105,6 +104,18 @@ def test_event_with_bookings():
     }
 
 
+@pytest.fixture(scope="module")
+def test_event_with_bookings():
+    """Event with bookings shared by the tests that only read it"""
+    return _create_event_with_bookings()
+
+
+@pytest.fixture
+def fresh_event_with_bookings():
+    """Event with bookings of its own, for tests that write to it"""
+    return _create_event_with_bookings()
+
+
 class TestAnalytics:
     """Test analytics endpoints"""
 
@@ -288,10 +299,10 @@ class TestAnalytics:
         assert breakdown["Standard"] == 1000.0  # B-1 + B-2
         assert breakdown["Economy"] == 0.0  # C-1 is held, not booked
 
-    def test_analytics_with_cancelled_booking(self, test_event_with_bookings):
+    def test_analytics_with_cancelled_booking(self, fresh_event_with_bookings):
         """Test analytics with a cancelled booking"""
-        event = test_event_with_bookings["event"]
-        bookings = test_event_with_bookings["bookings"]
+        event = fresh_event_with_bookings["event"]
+        bookings = fresh_event_with_bookings["bookings"]
 
         # Cancel one booking
         cancel_data = {"booking_id": bookings[0]["booking_id"]}
@@ -357,5 +368,34 @@ class TestAnalytics:
         )
         assert response.status_code == 200  # Should return empty list
 
+    def test_analytics_refresh_after_write(self, fresh_event_with_bookings):
+        """Test cached analytics are refreshed after a write to the event"""
+        event = fresh_event_with_bookings["event"]
+        users = fresh_event_with_bookings["users"]
+
+        response = client.get(f"/events/{event['event_id']}/analytics")
+        assert response.status_code == 200
+        hold_attempts = response.json()["hold_attempts"]
+
+        # Hold another seat, which bumps the event's hold_attempts counter
+        hold_data = {"user_id": users[0]["user_id"], "seats": ["A-2"]}
+        hold_response = client.post(f"/events/{event['event_id']}/hold", json=hold_data)
+        assert hold_response.status_code == 200
+
+        response = client.get(f"/events/{event['event_id']}/analytics")
+        assert response.status_code == 200
+        assert response.json()["hold_attempts"] == hold_attempts + 1
+
+    def test_comprehensive_booking_totals(self, test_event_with_bookings):
+        """Test comprehensive analytics prices each booking by its seats"""
+        event = test_event_with_bookings["event"]
+
+        response = client.get(f"/events/{event['event_id']}/comprehensive")
+        assert response.status_code == 200
 
+        booking_analytics = response.json()["booking_analytics"]
+        a1_booking = next(b for b in booking_analytics if "A-1" in b["seats"])
+        assert a1_booking["total_amount"] == 1000.0  # VIP price
 
+        b_booking = next(b for b in booking_analytics if "B-1" in b["seats"])
+        assert b_booking["total_amount"] == 1000.0  # 2 Standard seats
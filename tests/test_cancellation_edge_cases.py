@@ -137,6 +137,25 @@ class TestCancellationEdgeCases:
         assert cancel_response.status_code == 404
         assert "not found" in cancel_response.json()["detail"]
 
+    def test_cancellation_with_holding_id(self, test_setup_with_booking):
+        """Test cancellation with the ID of a holding rather than a booking"""
+        hold_data = {
+            "user_id": test_setup_with_booking["user"]["user_id"],
+            "seats": ["B-1"],
+        }
+        hold_response = client.post(
+            f"/events/{test_setup_with_booking['event']['event_id']}/hold",
+            json=hold_data,
+        )
+        assert hold_response.status_code == 200
+        holding_id = hold_response.json()["holding_id"]
+
+        cancel_response = client.post(
+            f"/{holding_id}/cancel", json={"booking_id": holding_id}
+        )
+        assert cancel_response.status_code == 404
+        assert "not found" in cancel_response.json()["detail"]
+
     def test_double_cancellation_attempt(self, test_setup_with_booking):
         """Test attempting to cancel the same booking twice"""
         booking = test_setup_with_booking["booking"]
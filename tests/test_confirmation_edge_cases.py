@@ -171,6 +171,26 @@ class TestConfirmationEdgeCases:
         assert confirm_response.status_code == 404
         assert "not found" in confirm_response.json()["detail"]
 
+    def test_confirmation_with_booking_id(self, test_setup):
+        """Test confirmation with the ID of a booking rather than a holding"""
+        hold_data = {"user_id": test_setup["user"]["user_id"], "seats": ["A-1"]}
+        hold_response = client.post(
+            f"/events/{test_setup['event']['event_id']}/hold", json=hold_data
+        )
+        assert hold_response.status_code == 200
+        holding = hold_response.json()
+
+        confirm_data = {"payment_status": "successful"}
+        confirm_response = client.post(
+            f"/{holding['holding_id']}/confirm", json=confirm_data
+        )
+        assert confirm_response.status_code == 200
+        booking_id = confirm_response.json()["booking_id"]
+
+        confirm_response = client.post(f"/{booking_id}/confirm", json=confirm_data)
+        assert confirm_response.status_code == 404
+        assert "not found" in confirm_response.json()["detail"]
+
     def test_expired_holding_confirmation(self, test_setup):
         """Test confirmation with expired holding"""
         # Hold seats
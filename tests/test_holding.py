@@ -120,6 +120,25 @@ def test_hold_seats_invalid_seat_positions(test_event_with_seats, test_user):
 
     assert response.status_code == 400
     assert "does not exist" in response.json()["detail"]
+    # Every missing seat is reported in the one error
+    assert "Z-99" in response.json()["detail"]
+    assert "X-100" in response.json()["detail"]
+
+
+def test_hold_seats_too_many(test_event_with_seats, test_user):
+    """Test holding more seats than one booking transaction can confirm"""
+    event = test_event_with_seats
+    user = test_user
+
+    hold_request = {
+        "user_id": user["user_id"],
+        "seats": [f"A-{seat_num}" for seat_num in range(1, 98)],
+    }
+
+    response = client.post(f"/events/{event['event_id']}/hold", json=hold_request)
+
+    assert response.status_code == 400
+    assert "at most 96 seats" in response.json()["detail"]
 
 
 def test_hold_seats_already_held(test_event_with_seats, test_user):
@@ -100,6 +100,40 @@ def test_city_filtering(test_events_data):
     assert len(filtered_events) >= 2
 
 
+def test_city_filtering_includes_similar_cities(test_events_data):
+    """Test the city filter also matches cities containing the query"""
+    venue_data = {
+        "name": "Navi Mumbai Grounds",
+        "city": "Navi Mumbai",
+        "description": "Grounds in Navi Mumbai",
+        "seat_types": ["Standard"],
+    }
+    venue = client.post("/venue", json=venue_data).json()
+    client.post(
+        f"/venue/{venue['venue_id']}/seats",
+        json={"seats": [{"row": "A", "seat_num": 1, "seat_type": "Standard"}]},
+    )
+    event_data = {
+        "venue_id": venue["venue_id"],
+        "name": "Open Air Festival",
+        "start_time": (datetime.now() + timedelta(days=2)).isoformat(),
+        "duration": 240,
+        "artists": ["Festival Band"],
+        "tags": ["festival"],
+        "description": "A festival in Navi Mumbai",
+        "seat_type_prices": {"Standard": 500.0},
+    }
+    event = client.post("/events", json=event_data).json()
+
+    response = client.get("/events?city=Mumbai&limit=1000")
+
+    assert response.status_code == 200
+    event_ids = [item["event_id"] for item in response.json()]
+    # Exact matches and the partial match are both returned
+    assert test_events_data[0]["event_id"] in event_ids
+    assert event["event_id"] in event_ids
+
+
 def test_date_range_filtering(test_events_data):
     """Test filtering events by date range"""
     events = test_events_data
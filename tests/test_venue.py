@@ -49,3 +49,20 @@ def test_get_venues_by_city():
     # All returned venues should be from Mumbai
     for venue in data:
         assert venue["city"].lower() == "mumbai"
+
+
+def test_get_venues_by_city_ignores_case():
+    """Test the venue city filter matches regardless of case"""
+    venue_data = {
+        "name": "Case Test Arena",
+        "city": "Pune",
+        "description": "A venue for the case-insensitive city filter",
+        "seat_types": ["Standard"],
+    }
+    venue_id = client.post("/venue/", json=venue_data).json()["venue_id"]
+
+    response = client.get("/venue/?city=pune")
+
+    assert response.status_code == 200
+    venue_ids = [venue["venue_id"] for venue in response.json()]
+    assert venue_id in venue_ids
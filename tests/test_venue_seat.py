@@ -87,6 +87,27 @@ def test_create_venue_seats_duplicate_seat(test_venue):
     assert "already exists" in response.json()["detail"]
 
 
+def test_create_venue_seats_duplicate_in_request(test_venue):
+    """Test creating the same seat twice in one request"""
+    venue_id = test_venue["venue_id"]
+
+    seat_data = {
+        "seats": [
+            {"row": "A", "seat_num": 1, "seat_type": "VIP"},
+            {"row": "A", "seat_num": 1, "seat_type": "VIP"},
+        ]
+    }
+
+    response = client.post(f"/venue/{venue_id}/seats", json=seat_data)
+
+    assert response.status_code == 409
+    assert "A-1" in response.json()["detail"]
+
+    # Nothing was written
+    response = client.get(f"/venue/{venue_id}/seats")
+    assert response.json() == []
+
+
 def test_get_venue_seats(test_venue):
     """Test getting all seats for a venue"""
     venue_id = test_venue["venue_id"]